@@ -1,11 +1,19 @@
 # -*- mode: python ; coding: utf-8 -*-
 
 import os
+import tomllib
 from pathlib import Path
 
 # プロジェクトのルートディレクトリ
 project_root = Path('.')
 
+# バージョンを埋め込み、実行時にpyproject.tomlを読まずに済むようにする
+# （ソースから実行した場合に古いバージョンを返さないよう、ビルド後に削除する）
+with open(project_root / 'pyproject.toml', 'rb') as f:
+    project_version = tomllib.load(f)['project']['version']
+version_file = project_root / 'src/snoreguard/_version.py'
+version_file.write_text(f'__version__ = "{project_version}"\n', encoding='utf-8')
+
 block_cipher = None
 
 # アセットファイルの収集
@@ -15,48 +23,50 @@ added_files = [
     (str(project_root / 'pyproject.toml'), '.'),
 ]
 
-a = Analysis(
-    ['src\\main.py'],
-    pathex=[str(project_root)],
-    binaries=[],
-    datas=added_files,
-    hiddenimports=[
-        'librosa',
-        'sounddevice', 
-        'pythonosc',
-        'customtkinter',
-        'matplotlib',
-        'numpy',
-        'scipy',
-    ],
-    hookspath=[],
-    hooksconfig={},
-    runtime_hooks=[],
-    excludes=[],
-    noarchive=False,
-    optimize=0,
-)
-pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+try:
+    a = Analysis(
+        ['src\\main.py'],
+        pathex=[str(project_root)],
+        binaries=[],
+        datas=added_files,
+        hiddenimports=[
+            'sounddevice', 
+            'pythonosc',
+            'customtkinter',
+            'matplotlib',
+            'numpy',
+            'scipy',
+        ],
+        hookspath=[],
+        hooksconfig={},
+        runtime_hooks=[],
+        excludes=[],
+        noarchive=False,
+        optimize=0,
+    )
+    pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    [],
-    name='SnoreGuard',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,  # ウィンドウアプリケーションなのでFalse
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon=str(project_root / 'src/assets/icon/icon.ico'),  # 実行ファイルのアイコン
-)
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.zipfiles,
+        a.datas,
+        [],
+        name='SnoreGuard',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,  # ウィンドウアプリケーションなのでFalse
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+        icon=str(project_root / 'src/assets/icon/icon.ico'),  # 実行ファイルのアイコン
+    )
+finally:
+    version_file.unlink(missing_ok=True)
@@ -1,14 +1,15 @@
+import functools
 import logging
-from collections import deque
+import time
+import warnings
 from collections.abc import Callable
-from datetime import datetime, timedelta
 from typing import Any, Dict, Tuple
 
-import librosa
 import numpy as np
-from scipy.signal import butter, sosfilt
+from scipy import fft as sp_fft
+from scipy.signal import butter, cheby1, sosfilt, sosfilt_zi
 
-from core.settings import RuleSettings, SnoreEvent
+from core.settings import RuleSettings, RuleSettingsView, SnoreEvent
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,8 @@ logger = logging.getLogger(__name__)
 class FeatureExtractor:
     """音声チャンクからRMS、スペクトル重心、ZCR、F0を抽出"""
 
+    CMNDF_THRESHOLD = 0.5  # 有声と判定する累積平均正規化差分関数（YIN）の上限
+
     def __init__(
         self,
         sample_rate: int,
@@ -28,78 +31,262 @@ class FeatureExtractor:
         self.hop_length = hop_length
         self.settings = settings
 
-    def extract_features(self, audio_chunk: np.ndarray) -> Dict[str, np.ndarray]:
-        """全特徴量を一括抽出"""
+        # 自己相関とスペクトルで共有するFFT長（巡回の重なりを避けて2倍長）
+        self._n_fft = 2 * frame_length
+        # スペクトル重心用の周波数軸（フレーム長のFFTのビン）
+        self._fft_freqs = np.fft.rfftfreq(frame_length, 1 / sample_rate).astype(
+            np.float32
+        )
+
+        # フレーム分割用のパディング済みバッファ（両端のゼロは書き換えない）
+        self._padded_buffer = np.zeros(0, dtype=np.float32)
+        # 抽出器の外へ出ない作業用配列（形状ごとに再利用）
+        self._work_buffers: Dict[Tuple[int, ...], np.ndarray] = {}
+
+    def extract_features(
+        self,
+        audio_chunk: np.ndarray,
+        center: bool = True,
+        energy_gate: float | None = None,
+        settings: RuleSettings | RuleSettingsView | None = None,
+    ) -> Dict[str, np.ndarray]:
+        """全特徴量を一括抽出（フレーム分割は1回のみ）
+
+        center=Falseでは両端をゼロ詰めせず、先頭からフレーム分割する
+        （前チャンクの末尾を付け足した連続ストリームの解析用）
+        energy_gateを指定すると、全フレームのRMSがそれ以下の場合に
+        スペクトル重心・ZCR・F0の計算を省略する（重心とZCRはNaNで不通過、
+        F0と有声確率は無声と同じ0を返す）
+        settingsには検出処理のチャンクごとのスナップショットを渡す
+        （省略時は生成時の設定を参照する）
+        """
+        if settings is None:
+            settings = self.settings
+        frames = self._frame_signal(audio_chunk, center)
+        energy = self._cumulative_energy(frames)  # RMSとF0で共有する累積エネルギー
+        rms = self._extract_rms(energy, audio_chunk)
+
+        # 無音チャンクではエネルギー条件を満たすフレームがなく、他の特徴量は不要
+        if energy_gate is not None and not np.any(rms > energy_gate):
+            # 重心とZCRは「未満」で通過するため、0ではなくNaNにして不通過とする
+            return {
+                "rms": rms,
+                "spectral_centroid": np.full(len(rms), np.nan, dtype=np.float32),
+                "zcr": np.full(len(rms), np.nan, dtype=np.float32),
+                "f0": np.zeros(len(rms), dtype=np.float32),
+                "voiced_probs": np.zeros(len(rms), dtype=np.float32),
+            }
+
+        spectrum = self._frame_spectrum(frames)  # 重心とF0で共有するFFT
         features = {
-            "rms": self._extract_rms(audio_chunk),
-            "spectral_centroid": self._extract_spectral_centroid(audio_chunk),
-            "zcr": self._extract_zcr(audio_chunk),
+            "rms": rms,
+            "spectral_centroid": self._extract_spectral_centroid(spectrum),
+            "zcr": self._extract_zcr(frames),
         }
-        features.update(self._extract_f0(audio_chunk))
+        features.update(self._extract_f0(spectrum, energy, settings))
         return features
 
-    def _extract_rms(self, audio_chunk: np.ndarray) -> np.ndarray:
+    def _work_buffer(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """形状ごとに使い回すfloat32の作業用配列を取得"""
+        buffer = self._work_buffers.get(shape)
+        if buffer is None:
+            buffer = self._work_buffers[shape] = np.empty(shape, dtype=np.float32)
+        return buffer
+
+    def _cumulative_energy(self, frames: np.ndarray) -> np.ndarray | None:
+        """フレームごとの二乗和の累積を作業用配列上で計算"""
+        try:
+            energy = self._work_buffer(frames.shape)
+            np.square(frames, out=energy)
+            np.cumsum(energy, axis=1, out=energy)
+            return energy
+        except Exception as e:
+            logger.error(f"エネルギー計算エラー: {e}")
+            return None
+
+    def _frame_spectrum(self, frames: np.ndarray) -> np.ndarray | None:
+        """窓なしフレームを2倍長にゼロ詰めしたFFTを計算"""
+        try:
+            # scipy.fftはfloat32のまま計算し、フレーム方向に並列化できる
+            return sp_fft.rfft(frames, n=self._n_fft, axis=1, workers=-1)
+        except Exception as e:
+            logger.error(f"FFT計算エラー: {e}")
+            return None
+
+    def _extract_rms(
+        self, energy: np.ndarray | None, audio_chunk: np.ndarray
+    ) -> np.ndarray:
         """RMSエネルギーを抽出（音量の指標）"""
+        if energy is None:
+            return self._fallback_rms(audio_chunk)
         try:
-            return librosa.feature.rms(
-                y=audio_chunk,
-                frame_length=self.frame_length,
-                hop_length=self.hop_length,
-            )[0]
+            # 累積エネルギーの末尾がフレーム全体の二乗和
+            return np.sqrt(energy[:, -1] / self.frame_length)
         except Exception as e:
             logger.error(f"RMS抽出エラー: {e}")
             return self._fallback_rms(audio_chunk)  # 手動計算でフォールバック
 
-    def _extract_spectral_centroid(self, audio_chunk: np.ndarray) -> np.ndarray:
+    def _extract_spectral_centroid(self, spectrum: np.ndarray | None) -> np.ndarray:
         """スペクトル重心を抽出（音色の指標）"""
+        if spectrum is None:
+            return self._fallback_spectral_centroid()
         try:
-            return librosa.feature.spectral_centroid(
-                y=audio_chunk,
-                sr=self.sample_rate,
-                n_fft=self.frame_length,
-                hop_length=self.hop_length,
-            )[0]
+            # 2倍長FFTの偶数ビンがフレーム長FFTのビンに一致する。周期Hann窓は
+            # 周波数領域では隣接ビンとの3タップ畳み込み (-1/4, 1/2, -1/4) になる
+            even = spectrum[:, ::2]
+            windowed = 0.5 * even
+            windowed[:, 1:] -= 0.25 * even[:, :-1]
+            windowed[:, :-1] -= 0.25 * even[:, 1:]
+            # 範囲外の隣接ビンは実信号の共役対称性で折り返す
+            windowed[:, 0] -= 0.25 * np.conj(spectrum[:, 2])
+            windowed[:, -1] -= 0.25 * np.conj(
+                spectrum[:, self._n_fft - 2 * even.shape[1]]
+            )
+            magnitude = np.abs(windowed)
+            total = magnitude.sum(axis=1)
+            return np.divide(
+                magnitude @ self._fft_freqs,
+                total,
+                out=np.zeros_like(total),
+                where=total > 0,
+            ).astype(np.float32, copy=False)
         except Exception as e:
             logger.error(f"スペクトル重心抽出エラー: {e}")
             return self._fallback_spectral_centroid()
 
-    def _extract_zcr(self, audio_chunk: np.ndarray) -> np.ndarray:
+    def _extract_zcr(self, frames: np.ndarray) -> np.ndarray:
         """ゼロ交差率を抽出（有声/無声の指標）"""
         try:
-            return librosa.feature.zero_crossing_rate(
-                y=audio_chunk,
-                frame_length=self.frame_length,
-                hop_length=self.hop_length,
-            )[0]
+            signs = np.signbit(frames)
+            crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+            return np.divide(crossings, self.frame_length, dtype=np.float32)
         except Exception as e:
             logger.error(f"ゼロ交差率抽出エラー: {e}")
             return self._fallback_zcr()
 
-    def _extract_f0(self, audio_chunk: np.ndarray) -> Dict[str, np.ndarray]:
-        """基本周波数（音の高さ）と有声確率を抽出"""
+    def _extract_f0(
+        self,
+        spectrum: np.ndarray | None,
+        energy: np.ndarray | None,
+        settings: RuleSettings | RuleSettingsView,
+    ) -> Dict[str, np.ndarray]:
+        """基本周波数（音の高さ）と有声確率をYINの累積平均正規化差分関数で推定"""
+        if spectrum is None or energy is None:
+            return self._fallback_f0()
         try:
-            f0, voiced_flag, voiced_probs = librosa.pyin(
-                y=audio_chunk,
-                fmin=self.settings.f0_min_hz,
-                fmax=self.settings.f0_max_hz,
-                frame_length=self.frame_length,
-                hop_length=self.hop_length,
-                sr=self.sample_rate,
+            # 探索するラグ範囲（F0範囲の逆数）
+            min_lag = max(1, int(self.sample_rate / settings.f0_max_hz))
+            max_lag = min(
+                self.frame_length - 1,
+                int(np.ceil(self.sample_rate / settings.f0_min_hz)),
+            )
+            if max_lag - min_lag < 2:
+                return self._fallback_f0()
+            all_lags = np.arange(1, max_lag + 1)
+            lag_values = all_lags.astype(np.float32)  # float64への昇格を避ける
+
+            # 共有スペクトルのパワーから全フレームの自己相関を一括で得る
+            power = spectrum.real**2 + spectrum.imag**2
+            # ラグ1〜max_lagは連続しているため、ファンシーインデックスでなく
+            # スライス（ビュー）で取り出してコピーを避ける
+            corr = sp_fft.irfft(power, n=self._n_fft, axis=1, workers=-1)[
+                :, 1 : max_lag + 1
+            ]
+
+            # 差分関数 d(τ) = 重なり区間の前後エネルギー - 2r(τ)
+            # （長いラグほど重なりが短くなるため、重なり長で割って平均化）
+            n = self.frame_length
+            head_energy = energy[:, n - 1 - max_lag : n - 1][:, ::-1]
+            tail_energy = energy[:, -1:] - energy[:, :max_lag]
+            diff = np.maximum(head_energy + tail_energy - 2 * corr, 0.0)
+            diff /= self.frame_length - lag_values
+
+            # 累積平均で正規化（τ=1からの平均に対する比）
+            cmndf = diff * lag_values / (np.cumsum(diff, axis=1) + 1e-10)
+            cmndf = cmndf[:, min_lag - 1 :]
+            lags = all_lags[min_lag - 1 :]
+
+            rows = np.arange(len(energy))
+            best = self._first_dip(cmndf)
+            trough = cmndf[rows, best]
+
+            # 谷が浅い、またはラグ範囲の端で最小となる場合は無声扱い
+            voiced = (
+                (best > 0) & (best < len(lags) - 1) & (trough < self.CMNDF_THRESHOLD)
+            )
+            # 放物線補間でラグをサブサンプル精度に補正
+            left = cmndf[rows, np.maximum(best - 1, 0)]
+            right = cmndf[rows, np.minimum(best + 1, len(lags) - 1)]
+            curvature = left - 2 * trough + right
+            offset = np.divide(
+                0.5 * (left - right),
+                curvature,
+                out=np.zeros_like(trough),
+                where=curvature > 0,
             )
-            return {"f0": np.nan_to_num(f0, nan=0.0), "voiced_probs": voiced_probs}
+            # 結果はfloat32の出力配列へ直接書き込む
+            f0 = np.zeros(len(energy), dtype=np.float32)
+            np.divide(self.sample_rate, lags[best] + offset, out=f0, where=voiced)
+            # 無声と判定したフレームの信頼度は0とする（雑音の浅い谷を通さない）
+            # 有声フレームは谷がCMNDF_THRESHOLD未満のため、0.5〜1の範囲に収まる
+            voiced_probs = np.where(voiced, 1.0 - trough, 0.0).astype(
+                np.float32, copy=False
+            )
+            return {"f0": f0, "voiced_probs": voiced_probs}
         except Exception as e:
             logger.error(f"F0抽出エラー: {e}")
             return self._fallback_f0()
 
+    def _first_dip(self, cmndf: np.ndarray) -> np.ndarray:
+        """YINと同じく、閾値を最初に下回った谷のラグ位置を各フレームで求める
+
+        全体の最小値を採ると倍周期（1オクターブ下）の谷を拾いやすいため、
+        閾値を下回った最初のラグから極小まで下った位置を採用する
+        （閾値を下回らないフレームは全体の最小値を使う）
+        """
+        below = cmndf < self.CMNDF_THRESHOLD
+        crossed = below.any(axis=1)
+        first = np.argmax(below, axis=1)
+        # 各ラグ以降で最初に下りが止まる位置（末尾まで下り続ける場合は末尾）
+        positions = np.arange(cmndf.shape[1])
+        stops = np.concatenate(
+            (cmndf[:, 1:] >= cmndf[:, :-1], np.ones((len(cmndf), 1), dtype=bool)),
+            axis=1,
+        )
+        local_min = np.argmax(stops & (positions >= first[:, np.newaxis]), axis=1)
+        return np.where(crossed, local_min, np.argmin(cmndf, axis=1))
+
+    def _frame_signal(self, audio_chunk: np.ndarray, center: bool = True) -> np.ndarray:
+        """librosaのcenter=Trueと同じ位置でフレーム分割"""
+        if not center:
+            if len(audio_chunk) < self.frame_length:
+                return np.zeros((0, self.frame_length), dtype=np.float32)
+            return np.lib.stride_tricks.sliding_window_view(
+                audio_chunk.astype(np.float32, copy=False), self.frame_length
+            )[:: self.hop_length]
+
+        pad = self.frame_length // 2
+        n = len(audio_chunk)
+        if len(self._padded_buffer) < n + 2 * pad:
+            self._padded_buffer = np.zeros(n + 2 * pad, dtype=np.float32)
+        padded = self._padded_buffer[: n + 2 * pad]
+        padded[pad : pad + n] = audio_chunk
+        padded[pad + n :] = 0.0
+        return np.lib.stride_tricks.sliding_window_view(padded, self.frame_length)[
+            :: self.hop_length
+        ]
+
     def _fallback_rms(self, audio_chunk: np.ndarray) -> np.ndarray:
-        """RMSの手動計算（librosa失敗時）"""
-        hop_samples = len(audio_chunk) // 20  # 20フレームに分割
-        rms_values = []
-        for i in range(0, len(audio_chunk), hop_samples):
-            window = audio_chunk[i : i + hop_samples]
-            if len(window) > 0:
-                rms_values.append(np.sqrt(np.mean(window**2)))  # RMS = 二乗平均平方根
-        return np.array(rms_values, dtype=np.float32)
+        """RMSの手動計算（フレーム処理失敗時）"""
+        hop_samples = max(1, len(audio_chunk) // 20)  # 20フレームに分割
+        squares = np.square(audio_chunk, dtype=np.float32)
+        # 区間ごとの二乗和をまとめて求め、端数の区間はその長さで平均する
+        starts = np.arange(0, len(squares), hop_samples)
+        if len(starts) == 0:
+            return np.zeros(0, dtype=np.float32)
+        sums = np.add.reduceat(squares, starts)
+        lengths = np.diff(starts, append=len(squares))
+        return np.sqrt(sums / lengths).astype(np.float32)  # RMS = 二乗平均平方根
 
     def _fallback_spectral_centroid(self) -> np.ndarray:
         """スペクトル重心のフォールバック値"""
@@ -120,216 +307,344 @@ class FeatureExtractor:
 class MaskProcessor:
     """マスク処理クラス"""
 
-    def __init__(self, max_frames: int, settings: RuleSettings):
+    RULE_NAMES = ("energy", "f0_confidence", "f0_range", "spectral_centroid", "zcr")
+    ALL_RULES_PASSED = (1 << len(RULE_NAMES)) - 1  # 全ルール通過時のビット列
+
+    def __init__(self, max_frames: int):
         self.max_frames = max_frames
-        self.settings = settings
         self._init_temp_arrays()
 
     def _init_temp_arrays(self):
-        """一時配列を初期化"""
-        self._temp_arrays = {
-            "energy_mask": np.zeros(self.max_frames, dtype=bool),
-            "f0_conf_mask": np.zeros(self.max_frames, dtype=bool),
-            "f0_range_mask": np.zeros(self.max_frames, dtype=bool),
-            "centroid_mask": np.zeros(self.max_frames, dtype=bool),
-            "zcr_mask": np.zeros(self.max_frames, dtype=bool),
-        }
+        """一時配列を初期化（フレームごとに各ルールの通過を1ビットずつ持つ）"""
+        self._rule_bits = np.zeros(self.max_frames, dtype=np.uint8)
+        self._passed = np.zeros(self.max_frames, dtype=bool)  # 判定結果の作業領域
+        self._upper_ok = np.zeros(self.max_frames, dtype=bool)  # F0上限判定の作業領域
+        self._shifted = np.zeros(self.max_frames, dtype=np.uint8)  # シフト用作業領域
+        self._bit_values = (1 << np.arange(len(self.RULE_NAMES))).astype(np.uint8)
 
     def create_masks(
-        self, features: Dict[str, np.ndarray]
-    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
-        """特徴量からマスクを作成"""
+        self, features: Dict[str, np.ndarray], settings: RuleSettingsView
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """特徴量からルール別ビット列と最終マスクを作成"""
         num_frames = len(features["rms"])
         num_frames = min(num_frames, self.max_frames)
-
-        # 各マスクを作成
-        self._temp_arrays["energy_mask"][:num_frames] = (
-            features["rms"][:num_frames] > self.settings.energy_threshold
-        )
-        self._temp_arrays["f0_conf_mask"][:num_frames] = (
-            features["voiced_probs"][:num_frames]
-            > self.settings.f0_confidence_threshold
-        )
-
-        f0_valid = np.logical_and(
-            features["f0"][:num_frames] > 0,
-            np.logical_and(
-                features["f0"][:num_frames] >= self.settings.f0_min_hz,
-                features["f0"][:num_frames] <= self.settings.f0_max_hz,
+        rule_bits = self._rule_bits[:num_frames]
+        passed = self._passed[:num_frames]
+        rule_bits[:] = 0
+
+        # 閾値はチャンクごとの設定スナップショットからfloat32へ一括変換する
+        (
+            energy_th,
+            f0_conf_th,
+            f0_min,
+            f0_max,
+            centroid_th,
+            zcr_th,
+        ) = self._threshold_snapshot(settings)
+
+        # 各ルールの判定を作業領域へ書き込み、対応するビットを立てる
+        np.greater(features["rms"][:num_frames], energy_th, out=passed)
+        any_energy = passed.any()
+        self._set_rule_bit(0, passed)
+
+        np.greater(features["voiced_probs"][:num_frames], f0_conf_th, out=passed)
+        self._set_rule_bit(1, passed)
+
+        # 無声フレームのF0は0のため、下限が正なら f0 > 0 の判定は下限判定に含まれる
+        # （UIのスライダーとキャリブレーションはいずれも下限を70Hz以上に保つ。
+        #   0以下は手編集された設定ファイルのみで起こり得る）
+        f0 = features["f0"][:num_frames]
+        if f0_min > 0:
+            np.greater_equal(f0, f0_min, out=passed)
+        else:
+            np.greater(f0, 0, out=passed)
+        upper_ok = self._upper_ok[:num_frames]
+        np.less_equal(f0, f0_max, out=upper_ok)
+        passed &= upper_ok
+        self._set_rule_bit(2, passed)
+
+        np.less(features["spectral_centroid"][:num_frames], centroid_th, out=passed)
+        self._set_rule_bit(3, passed)
+
+        np.less(features["zcr"][:num_frames], zcr_th, out=passed)
+        self._set_rule_bit(4, passed)
+
+        # 無音チャンクでは比較するまでもなく全フレーム不通過
+        if not any_energy:
+            return rule_bits, np.zeros(num_frames, dtype=bool)
+
+        # 最終マスクを作成（全ビットが立っているかを1回の比較で判定）
+        final_mask = rule_bits == self.ALL_RULES_PASSED
+
+        return rule_bits, final_mask
+
+    @staticmethod
+    def _threshold_snapshot(settings: RuleSettingsView) -> np.ndarray:
+        """閾値をfloat32配列として取得"""
+        return np.array(
+            (
+                settings.energy_threshold,
+                settings.f0_confidence_threshold,
+                settings.f0_min_hz,
+                settings.f0_max_hz,
+                settings.spectral_centroid_threshold,
+                settings.zcr_threshold,
             ),
-        )
-        self._temp_arrays["f0_range_mask"][:num_frames] = f0_valid
-
-        self._temp_arrays["centroid_mask"][:num_frames] = (
-            features["spectral_centroid"][:num_frames]
-            < self.settings.spectral_centroid_threshold
-        )
-        self._temp_arrays["zcr_mask"][:num_frames] = (
-            features["zcr"][:num_frames] < self.settings.zcr_threshold
+            dtype=np.float32,
         )
 
-        # 最終マスクを作成
-        final_mask = np.logical_and.reduce(
-            [
-                self._temp_arrays["energy_mask"][:num_frames],
-                self._temp_arrays["f0_conf_mask"][:num_frames],
-                self._temp_arrays["f0_range_mask"][:num_frames],
-                self._temp_arrays["centroid_mask"][:num_frames],
-                self._temp_arrays["zcr_mask"][:num_frames],
-            ]
-        )
-
-        pass_masks = {
-            "energy": self._temp_arrays["energy_mask"][:num_frames],
-            "f0_confidence": self._temp_arrays["f0_conf_mask"][:num_frames],
-            "f0_range": self._temp_arrays["f0_range_mask"][:num_frames],
-            "spectral_centroid": self._temp_arrays["centroid_mask"][:num_frames],
-            "zcr": self._temp_arrays["zcr_mask"][:num_frames],
-        }
+    def _set_rule_bit(self, bit: int, passed: np.ndarray):
+        """判定結果をルール別ビット列の指定ビットへ書き込む"""
+        shifted = self._shifted[: len(passed)]
+        np.left_shift(passed.view(np.uint8), bit, out=shifted)
+        self._rule_bits[: len(passed)] |= shifted
 
-        return pass_masks, final_mask
+    def count_rule_passes(self, num_frames: int) -> Dict[str, int]:
+        """直近のルール別ビット列から各ルールの通過フレーム数を数える"""
+        rule_bits = self._rule_bits[:num_frames, np.newaxis]
+        counts = np.count_nonzero(rule_bits & self._bit_values, axis=0)
+        return dict(zip(self.RULE_NAMES, counts.tolist()))
 
 
 class SegmentProcessor:
     """セグメント処理クラス"""
 
-    def __init__(self, hop_length: int, sample_rate: int, settings: RuleSettings):
+    def __init__(self, hop_length: int, sample_rate: int):
         self.hop_length = hop_length
         self.sample_rate = sample_rate
-        self.settings = settings
-        self.candidate_frames_info = []
 
     def process_segments(
-        self, final_mask: np.ndarray, features: Dict[str, np.ndarray]
+        self,
+        final_mask: np.ndarray,
+        features: Dict[str, np.ndarray],
+        settings: RuleSettingsView,
     ) -> list:
         """セグメントを処理してイベント候補を抽出"""
-        mask_changes = np.diff(
-            np.concatenate(([False], final_mask, [False])).astype(int)
+        if not final_mask.any():
+            return []
+
+        # 隣接XORで内部の立ち上がり/立ち下がりを一度に検出し、両端だけ個別に補う
+        # （エッジは必ず 開始, 終了, 開始, ... の順に交互に並ぶ）
+        edges = np.flatnonzero(final_mask[1:] ^ final_mask[:-1]) + 1
+        if final_mask[0]:
+            edges = np.insert(edges, 0, 0)
+        if final_mask[-1]:
+            edges = np.append(edges, len(final_mask))
+        starts = edges[0::2]
+        ends = edges[1::2]
+
+        # 持続時間の条件を満たすセグメントだけを配列演算で選別
+        durations = (ends - starts) * (self.hop_length / self.sample_rate)
+        valid = (durations >= settings.min_duration_seconds) & (
+            durations <= settings.max_duration_seconds
+        )
+        if not valid.any():
+            return []
+        starts, ends, durations = starts[valid], ends[valid], durations[valid]
+
+        # 累積和の差分で全セグメントの平均エネルギー・平均F0（有声のみ）を一括計算
+        rms = features["rms"][: len(final_mask)]
+        f0 = features["f0"][: len(final_mask)]
+        voiced = f0 > 0
+        rms_sums = np.concatenate(([0.0], np.cumsum(rms, dtype=np.float64)))
+        f0_sums = np.concatenate(
+            ([0.0], np.cumsum(np.where(voiced, f0, 0.0), dtype=np.float64))
+        )
+        voiced_counts = np.concatenate(([0], np.cumsum(voiced)))
+
+        avg_energies = (rms_sums[ends] - rms_sums[starts]) / (ends - starts)
+        f0_counts = voiced_counts[ends] - voiced_counts[starts]
+        avg_f0s = np.divide(
+            f0_sums[ends] - f0_sums[starts],
+            f0_counts,
+            out=np.zeros(len(starts)),
+            where=f0_counts > 0,
         )
-        starts = np.where(mask_changes == 1)[0]
-        ends = np.where(mask_changes == -1)[0]
-
-        events = []
-        for start, end in zip(starts, ends):
-            if end > start:
-                segment_data = [
-                    {"rms": features["rms"][i], "f0": features["f0"][i]}
-                    for i in range(start, end)
-                ]
-                event = self._create_event_from_segment(segment_data)
-                if event:
-                    events.append(event)
-
-        return events
-
-    def _create_event_from_segment(self, segment_data: list) -> SnoreEvent | None:
-        """セグメントデータからイベントを作成"""
-        if not segment_data:
-            return None
-
-        event_duration = len(segment_data) * self.hop_length / self.sample_rate
-
-        if not (
-            self.settings.min_duration_seconds
-            <= event_duration
-            <= self.settings.max_duration_seconds
-        ):
-            return None
 
-        rms_values = np.array([data["rms"] for data in segment_data], dtype=np.float32)
-        f0_values = np.array([data["f0"] for data in segment_data], dtype=np.float32)
+        now = time.monotonic()
+        return [
+            SnoreEvent(timestamp=now, duration=float(d), f0=float(f), energy=float(e))
+            for d, f, e in zip(durations, avg_f0s, avg_energies)
+        ]
 
-        avg_energy = float(np.mean(rms_values))
-        valid_f0s = f0_values[f0_values > 0]
-        avg_f0 = float(np.mean(valid_f0s)) if len(valid_f0s) > 0 else 0.0
 
-        return SnoreEvent(
-            timestamp=datetime.now(),
-            duration=event_duration,
-            f0=avg_f0,
-            energy=avg_energy,
+@functools.lru_cache(maxsize=None)
+def _warmup_feature_extraction(sample_rate: int, frame_length: int, hop_length: int):
+    """特徴量抽出のウォームアップ（同じ構成ではプロセス内で1回のみ実行）"""
+    try:
+        logger.debug("特徴量抽出をウォームアップ中...")
+        extractor = FeatureExtractor(
+            sample_rate, frame_length, hop_length, RuleSettings()
         )
+        dummy_audio = np.random.random(sample_rate // 10).astype(np.float32)
+        extractor.extract_features(dummy_audio)
+        logger.debug("特徴量抽出のウォームアップ完了")
+    except Exception as e:
+        logger.error(f"特徴量抽出のウォームアップ中にエラー: {e}")
 
 
 class RuleBasedProcessor:
     """ルールベースのイベント検知クラス"""
 
+    SAMPLE_RATE = 16000  # 入力サンプリングレート
+    # 帯域通過後（〜1600Hz）は4kHzで十分なため、間引いてから特徴量を抽出
+    DECIMATION_FACTOR = 4
+    FRAME_LENGTH = 200  # 50ms（間引き後）
+    HOP_LENGTH = 50  # 12.5ms（間引き後）
+
     def __init__(self, settings: RuleSettings, callback: Callable[[], None]):
         self.settings = settings
         self.on_snore_detected = callback
 
         # 音声処理パラメータ
-        self.sample_rate = 16000
-        self.frame_length = 800
-        self.hop_length = 200
-        self.max_frames = int(self.sample_rate * 5.0 / self.hop_length)
-
-        # イベント管理
-        self.recent_events: deque = deque(maxlen=20)
-
-        # フィルター
-        self.sos_filter = butter(
+        self.sample_rate = self.SAMPLE_RATE
+        self.decimation_factor = self.DECIMATION_FACTOR
+        self.analysis_sample_rate = self.sample_rate // self.decimation_factor
+        self.frame_length = self.FRAME_LENGTH
+        self.hop_length = self.HOP_LENGTH
+        self.max_frames = int(self.analysis_sample_rate * 5.0 / self.hop_length)
+
+        # イベント管理（直近イベントの単調時刻を古い順に保持する固定長配列）
+        self.max_recent_events = 20
+        self._event_times = np.empty(self.max_recent_events, dtype=np.float64)
+        self._event_count = 0
+
+        # フィルター（帯域通過 + 4kHz間引き用アンチエイリアスの2次セクション縦続）
+        bandpass_sos = butter(
             N=5, Wn=[80, 1600], btype="bandpass", fs=self.sample_rate, output="sos"
         )
+        # scipy.signal.decimateのIIR既定値と同じ設計
+        antialias_sos = cheby1(
+            N=8, rp=0.05, Wn=0.8 / self.decimation_factor, output="sos"
+        )
+        # 設計はfloat64で行い、入力と揃えてfloat32でフィルタリングする
+        sos_filter = np.vstack([bandpass_sos, antialias_sos])
+        self.sos_filter = sos_filter.astype(np.float32)
+        self._filter_zi_template = sosfilt_zi(sos_filter).astype(np.float32)
+        self._filter_state: np.ndarray | None = None  # チャンク間で引き継ぐ内部状態
+        self._decimation_offset = 0  # 次チャンクで最初に採用するサンプル位置
+        # 前チャンクで未使用の末尾（次フレームの開始位置以降）を先頭に残した
+        # 間引き後の信号（チャンク境界をまたぐフレームも途切れずに解析できる）
+        # 末尾の長さはチャンク長によって変わり、フレーム長未満に収まる
+        self._initial_tail_length = self.frame_length - self.hop_length
+        self._tail_length = self._initial_tail_length
+        self._decimated_buffer = np.zeros(
+            self.frame_length + self.sample_rate // self.decimation_factor,
+            dtype=np.float32,
+        )
 
         # コンポーネント初期化
         self.feature_extractor = FeatureExtractor(
-            self.sample_rate, self.frame_length, self.hop_length, self.settings
+            self.analysis_sample_rate,
+            self.frame_length,
+            self.hop_length,
+            self.settings,
         )
-        self.mask_processor = MaskProcessor(self.max_frames, self.settings)
+        self.mask_processor = MaskProcessor(self.max_frames)
         self.segment_processor = SegmentProcessor(
-            self.hop_length, self.sample_rate, self.settings
+            self.hop_length, self.analysis_sample_rate
         )
 
-        self._warmup_librosa()
+        self.warmup()
         logger.debug("RuleBasedProcessor 初期化完了")
 
-    def _warmup_librosa(self):
-        """librosa機能のプリコンパイル"""
-        try:
-            logger.debug("librosa機能をプリコンパイル中...")
-            dummy_audio = np.random.random(self.sample_rate // 10).astype(np.float32)
-            self.feature_extractor.extract_features(dummy_audio)
-            logger.debug("librosaプリコンパイル完了")
-        except Exception as e:
-            logger.error(f"librosaプリコンパイル中にエラー: {e}")
+    @classmethod
+    def warmup(cls):
+        """プロセッサーを生成せずに特徴量抽出をウォームアップ"""
+        _warmup_feature_extraction(
+            cls.SAMPLE_RATE // cls.DECIMATION_FACTOR, cls.FRAME_LENGTH, cls.HOP_LENGTH
+        )
+
+    def reset_stream_state(self):
+        """フィルター状態のリセット（新しいストリーム開始時）"""
+        self._filter_state = None
+        self._decimation_offset = 0
+        self._tail_length = self._initial_tail_length
+        self._decimated_buffer[: self._tail_length] = 0.0
 
     def reset_periodicity(self):
         """周期性イベントキューのリセット"""
-        self.recent_events.clear()
+        self._event_count = 0
         logger.debug("周期性イベントキューがリセットされました。")
 
     def process_audio_chunk(self, audio_chunk: np.ndarray) -> Dict[str, Any]:
         """音声チャンクの処理"""
-        filtered_chunk = sosfilt(self.sos_filter, audio_chunk, axis=0)
+        audio_chunk = np.ascontiguousarray(audio_chunk, dtype=np.float32)
+        # UIスレッドによる変更が途中で混ざらないよう、設定はチャンクごとに固定する
+        settings = self.settings.view()
+
+        # 前チャンクのフィルター状態を引き継いで連続的にフィルタリング
+        if self._filter_state is None:
+            self._filter_state = self._filter_zi_template * audio_chunk[0]
+        filtered_chunk, self._filter_state = sosfilt(
+            self.sos_filter, audio_chunk, zi=self._filter_state
+        )
 
-        # 特徴量抽出
-        features = self.feature_extractor.extract_features(filtered_chunk)
+        # 4kHzへ間引き（チャンク境界をまたいでも間引き位相を維持）
+        decimated_view = filtered_chunk[
+            self._decimation_offset :: self.decimation_factor
+        ]
+        tail = self._tail_length
+        stream_length = tail + len(decimated_view)
+        if stream_length > len(self._decimated_buffer):
+            grown = np.zeros(stream_length, dtype=np.float32)
+            grown[:tail] = self._decimated_buffer[:tail]
+            self._decimated_buffer = grown
+        stream = self._decimated_buffer[:stream_length]
+        np.copyto(stream[tail:], decimated_view, casting="same_kind")
+        self._decimation_offset = (
+            self._decimation_offset - len(audio_chunk)
+        ) % self.decimation_factor
+
+        # 特徴量抽出（前チャンク末尾から連続したフレーム位置で分割）
+        features = self.feature_extractor.extract_features(
+            stream,
+            center=False,
+            energy_gate=settings.energy_threshold,
+            settings=settings,
+        )
+        # 次チャンク用に、次のフレーム開始位置以降の末尾を先頭へ移す
+        # （チャンク長がホップ長の倍数でなくてもフレーム位置がずれない）
+        if stream_length >= self.frame_length:
+            num_frames = (stream_length - self.frame_length) // self.hop_length + 1
+            next_start = num_frames * self.hop_length
+        else:
+            next_start = 0
+        self._tail_length = stream_length - next_start
+        self._decimated_buffer[: self._tail_length] = stream[next_start:]
         if not features:
             return {}
 
+        # ZCRはサンプル単位の比率のため、閾値互換の16kHz換算に戻す
+        features["zcr"] /= self.decimation_factor
+
         # フレーム数制限
         features = self._limit_frame_count(features)
 
         # マスク作成
-        pass_masks, final_mask = self.mask_processor.create_masks(features)
+        _, final_mask = self.mask_processor.create_masks(features, settings)
+        pass_counts = self.mask_processor.count_rule_passes(len(final_mask))
 
         # セグメント処理
-        events = self.segment_processor.process_segments(final_mask, features)
+        events = self.segment_processor.process_segments(final_mask, features, settings)
         for event in events:
-            self.recent_events.append(event)
-            self._check_periodicity()
+            self._append_event_time(event.timestamp)
+            self._check_periodicity(settings)
 
         # 統計計算
-        self._calculate_detailed_stats(features, pass_masks)
+        self._calculate_detailed_stats(features, pass_counts, len(final_mask))
 
         return {
-            "analysis_results": features,
-            "pass_masks": pass_masks,
+            # 閾値判定はfloat32で済んでいるため、UI表示用はfloat16に縮めて渡す
+            "analysis_results": {
+                key: values.astype(np.float16) for key, values in features.items()
+            },
+            # UIはルールごとの通過有無しか使わないため、通過フレーム数だけを渡す
+            "pass_counts": pass_counts,
             "final_mask_frames": final_mask,
-            "recent_events_count": len(self.recent_events),
-            "first_event_timestamp": self.recent_events[0].timestamp
-            if self.recent_events
+            "recent_events_count": self._event_count,
+            "first_event_timestamp": float(self._event_times[0])
+            if self._event_count
             else None,
         }
 
@@ -346,67 +661,74 @@ class RuleBasedProcessor:
                 features[key] = features[key][: self.max_frames]
         return features
 
-    def _check_periodicity(self):
+    def _append_event_time(self, timestamp: float):
+        """イベント時刻を追加（満杯時は最も古いものを捨てる）"""
+        times = self._event_times
+        if self._event_count == len(times):
+            times[:-1] = times[1:]
+            self._event_count -= 1
+        times[self._event_count] = timestamp
+        self._event_count += 1
+
+    def _check_periodicity(self, settings: RuleSettingsView):
         """周期性のチェック"""
-        now = datetime.now()
-        window_start_time = now - timedelta(
-            seconds=self.settings.periodicity_window_seconds
-        )
+        cutoff = time.monotonic() - settings.periodicity_window_seconds
 
-        # 古いイベントを削除
-        while (
-            self.recent_events and self.recent_events[0].timestamp < window_start_time
-        ):
-            self.recent_events.popleft()
+        # 古いイベントを削除（時刻は昇順のため二分探索で境界を求める）
+        times = self._event_times
+        expired = int(np.searchsorted(times[: self._event_count], cutoff))
+        if expired:
+            self._event_count -= expired
+            times[: self._event_count] = times[expired : expired + self._event_count]
 
         # 周期性チェック
-        if len(self.recent_events) >= self.settings.periodicity_event_count:
+        if self._event_count >= settings.periodicity_event_count:
             logger.info(
-                f"いびき検知成功！周期ウィンドウ内に{len(self.recent_events)}回のイベントを検出"
+                f"いびき検知成功！周期ウィンドウ内に{self._event_count}回のイベントを検出"
             )
             self.on_snore_detected()
-            self.recent_events.clear()
+            self._event_count = 0
 
     def _calculate_detailed_stats(
-        self, features: Dict[str, np.ndarray], pass_masks: Dict[str, np.ndarray]
+        self,
+        features: Dict[str, np.ndarray],
+        pass_counts: Dict[str, int],
+        num_frames: int,
     ) -> Dict[str, float]:
-        """詳細な統計を計算"""
+        """詳細な統計を計算（全特徴量を1つの行列にまとめて一括集計）"""
         stats = {}
 
-        # 特徴量の統計
-        for key, values in features.items():
-            if values is not None and len(values) > 0:
-                try:
-                    valid_values = (
-                        values[~np.isnan(values)]
-                        if hasattr(values, "dtype")
-                        and np.issubdtype(values.dtype, np.floating)
-                        else values
-                    )
-                    if len(valid_values) > 0:
-                        stats[f"{key}_avg"] = float(np.mean(valid_values))
-                        stats[f"{key}_max"] = float(np.max(valid_values))
-                        stats[f"{key}_min"] = float(np.min(valid_values))
-                    else:
+        # 特徴量の統計（NaNは各行の集計から除外）
+        keys = [k for k, v in features.items() if v is not None and len(v) > 0]
+        if keys:
+            try:
+                matrix = np.vstack([features[k] for k in keys]).astype(
+                    np.float32, copy=False
+                )
+                # 全要素NaNの行はNaNになる（警告は抑制し、後で0.0に置き換える）
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", RuntimeWarning)
+                    avgs = np.nanmean(matrix, axis=1)
+                    maxs = np.nanmax(matrix, axis=1)
+                    mins = np.nanmin(matrix, axis=1)
+                for i, key in enumerate(keys):
+                    if np.isnan(avgs[i]):
                         stats[f"{key}_avg"] = stats[f"{key}_max"] = stats[
                             f"{key}_min"
                         ] = 0.0
-                except Exception as e:
-                    logger.error(f"統計計算エラー ({key}): {e}")
+                    else:
+                        stats[f"{key}_avg"] = float(avgs[i])
+                        stats[f"{key}_max"] = float(maxs[i])
+                        stats[f"{key}_min"] = float(mins[i])
+            except Exception as e:
+                logger.error(f"統計計算エラー: {e}")
+                for key in keys:
                     stats[f"{key}_avg"] = stats[f"{key}_max"] = stats[f"{key}_min"] = (
                         0.0
                     )
 
-        # マスクの統計
-        for key, mask in pass_masks.items():
-            try:
-                stats[f"{key}_pass_rate"] = (
-                    float(np.mean(mask.astype(float)))
-                    if mask is not None and len(mask) > 0
-                    else 0.0
-                )
-            except Exception as e:
-                logger.error(f"マスク統計計算エラー ({key}): {e}")
-                stats[f"{key}_pass_rate"] = 0.0
+        # マスクの統計（ルール別の通過フレーム数から通過率を求める）
+        for key, count in pass_counts.items():
+            stats[f"{key}_pass_rate"] = count / num_frames if num_frames > 0 else 0.0
 
         return stats
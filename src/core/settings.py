@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 
 import logging
-from dataclasses import dataclass, field
-from datetime import datetime
+import time
+from dataclasses import dataclass, field, fields
+from typing import NamedTuple
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SnoreEvent:
     """
     - 検出されたいびきイベントの情報を格納するデータクラス
@@ -15,13 +16,15 @@ class SnoreEvent:
      などの詳細情報が記録される
     """
 
-    timestamp: datetime = field(default_factory=datetime.now)  # イベント発生時刻
+    # イベント発生時刻（time.monotonic()の秒。壁時計の変更の影響を受けない）
+    # 単調時刻の値自体はログで意味を持たないため、reprには含めない
+    timestamp: float = field(default_factory=time.monotonic, repr=False)
     duration: float = 0.0  # 持続時間 (秒)
     f0: float = 0.0  # 平均基本周波数 (Hz)
     energy: float = 0.0  # 平均エネルギー (RMS)
 
 
-@dataclass
+@dataclass(slots=True)
 class RuleSettings:
     """
     - いびき検出アルゴリズムのパラメータ設定を管理するデータクラス
@@ -49,8 +52,40 @@ class RuleSettings:
     min_event_interval_seconds: float = 2.0  # いびきイベント間の最小間隔（秒）
     max_event_interval_seconds: float = 10.0  # いびきイベント間の最大間隔（秒）
 
+    def view(self) -> "RuleSettingsView":
+        """検出処理用の読み取り専用スナップショットを作成"""
+        return RuleSettingsView(
+            *(getattr(self, name) for name in RuleSettingsView._fields)
+        )
 
-@dataclass
+
+class RuleSettingsView(NamedTuple):
+    """
+    - RuleSettingsの読み取り専用スナップショット（フィールド順は同一）
+    - 検出処理はチャンクごとにこれを1回作成して参照し、UIスレッドによる
+     設定変更が処理の途中で混ざらないようにする
+    """
+
+    energy_threshold: float
+    f0_confidence_threshold: float
+    spectral_centroid_threshold: float
+    zcr_threshold: float
+    min_duration_seconds: float
+    max_duration_seconds: float
+    f0_min_hz: float
+    f0_max_hz: float
+    periodicity_event_count: int
+    periodicity_window_seconds: int
+    min_event_interval_seconds: float
+    max_event_interval_seconds: float
+
+
+# RuleSettingsへのフィールド追加に追従し忘れた場合は読み込み時に検出する
+if RuleSettingsView._fields != tuple(f.name for f in fields(RuleSettings)):
+    raise TypeError("RuleSettingsViewのフィールドがRuleSettingsと一致しません")
+
+
+@dataclass(slots=True)
 class TimeSchedulerSettings:
     """
     タイムスケジューラーの設定を管理するデータクラス
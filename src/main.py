@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import customtkinter as ctk
-import time
-from snoreguard.app import SnoreGuardApp
 from snoreguard.quick_splash import QuickSplashScreen
 
 logging.basicConfig(
@@ -11,33 +12,37 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _warmup_audio_engine():
+    """特徴量抽出のウォームアップ（FFTやフィルター設計の初回コストを前払い）"""
+    from core.rule_processor import RuleBasedProcessor
+
+    # プロセッサーと同じ構成でウォームアップ（以降の生成時は再実行されない）
+    RuleBasedProcessor.warmup()
+
+
+def _load_app_modules():
+    """メインアプリのモジュール群を読み込む"""
+    import snoreguard.app  # noqa: F401
+
+
 def prepare_app_data(status_callback):
     """
     アプリケーションの初期化処理を実行
     - 音声分析エンジンのプリコンパイル
     - 設定ファイルの読み込み
     - 時間のかかる初期化処理を段階的に実行
-    - スプラッシュ画面に進捗を表示
+    - スプラッシュ画面に進捗を表示（表示は実際の処理の区切りで切り替える）
     """
     try:
-        # 段階的初期化
-        status_callback("システム初期化中...")
-        time.sleep(0.3)
-
-        status_callback("音声エンジン準備中...")
-        # librosaのプリコンパイルを実行
-        from core.rule_processor import RuleBasedProcessor
-        from core.settings import RuleSettings
-
-        # ダミーのプロセッサーでlibrosaをプリコンパイル
-        temp_settings = RuleSettings()
-        RuleBasedProcessor(temp_settings, lambda: None)
-
-        status_callback("設定読み込み中...")
-        time.sleep(0.3)
-
-        status_callback("最終調整中...")
-        time.sleep(0.2)
+        status_callback("音声エンジン・画面準備中...")
+        # ウォームアップと画面モジュールの読み込みは独立しているため並行して実行
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(_warmup_audio_engine),
+                executor.submit(_load_app_modules),
+            ]
+            for future in futures:
+                future.result()  # 例外があればここで再送出
 
         return True
 
@@ -55,6 +60,9 @@ def create_and_run_main_app():
     - ウィンドウの位置やサイズを適切に設定
     - 確実に前面に表示されるよう制御
     """
+    # スプラッシュ表示前に読み込まないよう、ここでインポート
+    from snoreguard.app import SnoreGuardApp
+
     try:
         # 新しいTkインスタンスでメインウィンドウを作成
         root = ctk.CTk()
@@ -70,18 +78,11 @@ def create_and_run_main_app():
         # SnoreGuardAppを初期化
         SnoreGuardApp(root)
 
-        # ウィンドウを確実に表示
-        root.deiconify()  # 表示
-        root.state("normal")  # 通常状態に
-        root.lift()  # 前面に表示
-        root.focus_force()  # フォーカスを設定
-        root.attributes("-topmost", True)  # 一時的に最前面に
-        root.after(
-            200, lambda: root.attributes("-topmost", False)
-        )  # 200ms後に最前面を解除
-
-        # 確実に表示されるよう少し待つ
-        root.update()
+        # ウィンドウを表示して前面へ（最前面の設定と解除を続けて行い、1回で前面化）
+        root.deiconify()
+        root.wm_attributes("-topmost", True)
+        root.wm_attributes("-topmost", False)
+        root.after_idle(root.focus_force)  # 最初のアイドル時にフォーカスを設定
 
         # メインループ開始
         root.mainloop()
@@ -100,28 +101,19 @@ def main():
     """
     splash = QuickSplashScreen()
 
-    # 初期化完了フラグ
-    initialization_complete = False
-
-    def end_splash_and_show_main():
-        """スプラッシュ画面を終了してメインアプリ準備"""
-        nonlocal initialization_complete
-        if not initialization_complete:
-            return
-        # スプラッシュのメインループを終了
-        splash.splash_root.quit()
+    # 初期化完了イベント（初期化スレッドがprepare_app_dataの完了時にセット）
+    initialization_complete = threading.Event()
 
     def on_initialization_complete():
-        """初期化完了時に呼び出されるコールバック関数"""
-        nonlocal initialization_complete
-        initialization_complete = True
-        # スプラッシュのメインループ内で終了をスケジュール
-        splash.splash_root.after(300, end_splash_and_show_main)
+        """初期化完了時に呼び出されるコールバック関数（メインスレッドで実行）"""
+        # 待機せずにスプラッシュのメインループを終了
+        splash.splash_root.quit()
 
     def initialization_task(status_callback):
         """バックグラウンドで実行される初期化処理"""
         try:
             prepare_app_data(status_callback)
+            initialization_complete.set()
         except Exception as e:
             logger.error(f"初期化エラー: {e}")
             raise
@@ -139,14 +131,11 @@ def main():
         logger.error(f"スプラッシュエラー: {e}")
 
     # スプラッシュ終了後、メインアプリを作成・実行
-    if initialization_complete:
+    if initialization_complete.is_set():
         try:
             # 適切なclose()メソッドを使用してアニメーションを停止
             splash.close()
 
-            # 少し待ってからメインアプリを作成
-            time.sleep(0.1)
-
             create_and_run_main_app()
         except Exception as e:
             logger.error(f"メインアプリエラー: {e}")
@@ -1,6 +1,5 @@
 import logging
 import sys
-import tomllib
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -11,6 +10,8 @@ def get_project_version() -> str:
     pyproject.tomlからプロジェクトのバージョンを取得します
     """
     try:
+        import tomllib  # ビルド時に埋め込んだバージョンがない場合のみ必要
+
         if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
             project_root = Path(sys._MEIPASS)
         else:
@@ -37,7 +38,11 @@ def get_project_version() -> str:
         return "0.0.0"
 
 
-__version__ = get_project_version()
+try:
+    # ビルド時にSnoreGuard.specが書き出すバージョン
+    from snoreguard._version import __version__
+except ImportError:
+    __version__ = get_project_version()
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
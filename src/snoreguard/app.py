@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 import logging
-import queue
 import threading
 import time
 import tkinter as tk
 import winsound
-from dataclasses import asdict
-from datetime import datetime
+from collections import deque
+from dataclasses import asdict, fields
 from pathlib import Path
 from tkinter import messagebox
 
@@ -17,12 +16,12 @@ import sounddevice as sd
 from core.settings import RuleSettings, TimeSchedulerSettings
 from snoreguard.audio_service import AudioService
 from snoreguard.settings_manager import SettingsManager
-from snoreguard.time_scheduler import TimeScheduler
+from snoreguard.time_scheduler import TimeScheduler, parse_hhmm
 from snoreguard.vrc.handler import VRCHandler
 
 from snoreguard import __version__
 from snoreguard.updater import Updater
-from snoreguard.calibration_modal import CalibrationModal
+from snoreguard.calibration_modal import CalibrationModal, calibration_changes
 
 
 class ThreadSafeHandler:
@@ -32,7 +31,8 @@ class ThreadSafeHandler:
     def safe_after(root, func, *args, **kwargs):
         """メインループが開始前の場合を考慮した安全なafter呼び出し"""
         try:
-            return root.after(0, func, *args, **kwargs)
+            # 遅延なしの受け渡しはタイマーを使わず、次のアイドル時に実行する
+            return root.after_idle(func, *args, **kwargs)
         except RuntimeError as e:
             if "main thread is not in main loop" in str(e):
                 logger.debug(f"メインループ開始前のためスキップ: {func.__name__}")
@@ -40,11 +40,6 @@ class ThreadSafeHandler:
             else:
                 raise
 
-    @staticmethod
-    def safe_log(root, add_log_func, message: str, level: str = "info"):
-        """スレッドセーフなログ追加"""
-        ThreadSafeHandler.safe_after(root, add_log_func, message, level)
-
 
 def _get_settings_file_path():
     """
@@ -59,12 +54,39 @@ def _get_settings_file_path():
 
 SETTINGS_FILE = _get_settings_file_path()
 UPDATE_INTERVAL_MS = 50
+HIDDEN_UPDATE_INTERVAL_MS = 500  # ウィンドウ非表示中の更新間隔
+LOG_FLUSH_INTERVAL_MS = 50  # 他スレッドからのログをまとめて表示する間隔
+UPDATE_CHECK_DELAY_MS = 5000  # 起動からアップデート確認までの待ち時間
+# スケジューラー設定の既定値（参照専用。呼び出しごとに生成しない）
+DEFAULT_SCHEDULER_SETTINGS = TimeSchedulerSettings()
+# 保存済み設定から読み込むRuleSettingsのフィールド名
+RULE_SETTING_FIELDS = frozenset(f.name for f in fields(RuleSettings))
+# ルール設定スライダーの値ラベルの表示形式（整数はそのまま、小数は3桁）
+RULE_SETTING_LABEL_FORMATS = {
+    f.name: "{:.3f}" if f.type is float else "{}" for f in fields(RuleSettings)
+}
+# VRChatへ状態を送るOSCアドレス（検出中, 通知音, 自動ミュートの順）
+FEEDBACK_OSC_ADDRESSES = (
+    "/avatar/parameters/SnoreGuard/ToggleDetection",
+    "/avatar/parameters/SnoreGuard/SetNotification",
+    "/avatar/parameters/SnoreGuard/SetAutoMute",
+)
+# 詳細ステータス表示: 表示キー -> (分析結果のキー, 表示形式)
+DETAILED_STATUS_FORMATS = {
+    "energy": ("rms", "{:.4f}"),
+    "f0_confidence": ("voiced_probs", "{:.3f}"),
+    "spectral_centroid": ("spectral_centroid", "{:.1f}"),
+    "zcr": ("zcr", "{:.4f}"),
+    "f0": ("f0", "{:.1f} Hz"),
+}
 
 logger = logging.getLogger(__name__)
 
 
 # アプリケーションクラス
 class SnoreGuardApp:
+    _initial_feedback_sent = False  # 初期状態フィードバック送信済みフラグ
+
     def __init__(self, root: ctk.CTk):
         logger.debug("SnoreGuardApp初期化開始")
         ctk.set_appearance_mode("dark")
@@ -75,11 +97,18 @@ class SnoreGuardApp:
         self.HAS_OSC = True  # OSC接続有無
         self.is_running = False  # 検出中フラグ
         self.input_devices = {}  # 入力デバイス
-        self.periodicity_timer_start_time = None  # 周期タイマー開始時間
+        self._devices_ready = False  # マイク一覧の取得・反映が完了したか
+        self.periodicity_timer_start_time = None  # 周期タイマー開始時間（単調時刻）
         self.is_vrchat_muted = None  # VRChatミュート状態
+        self._last_mute_notified = None  # メインスレッドへ最後に渡したミュート状態
         self.is_awaiting_mute_sync = False  # ミュート同期待機フラグ
         self.sync_timeout_id = None  # ミュート同期タイムアウトID
         self.is_initializing = False  # 初期化中フラグ
+        self._update_ui_ready = False  # アップデート通知UIの作成完了フラグ
+        # 最後にVRChatへ送信できた状態（検出中, 通知音, 自動ミュート）。未送信ならNone
+        self._last_feedback_state: tuple[bool, bool, bool] | None = None
+        # スケジューラーの時刻変数（開始時, 開始分, 終了時, 終了分）。UI作成前はNone
+        self._scheduler_time_vars: tuple[tk.StringVar, ...] | None = None
         self.initialization_progress = 0  # 初期化進捗
 
         # 設定マネージャー初期化
@@ -92,14 +121,34 @@ class SnoreGuardApp:
         # ルール設定初期化
         self.rule_settings = RuleSettings()
 
-        # データキュー初期化
-        self.data_queue = queue.Queue(maxsize=25)
-
-        # 表示バッファ初期化
-        self.display_buffer = np.zeros(AudioService.SAMPLE_RATE, dtype=np.float32)
-
-        # 表示マスク初期化
-        self.display_mask = np.zeros(1, dtype=bool)
+        # データキュー初期化（append/popleftはスレッド間で安全に使える。
+        # 満杯時は古いものから捨て、GUIには常に新しいデータが残る）
+        self.data_queue: deque = deque(maxlen=25)
+        # 他スレッドからのログ（1行ずつTkへ渡さず、定期的にまとめて表示する）
+        self._log_queue: deque = deque()
+
+        # 表示バッファ初期化（リングバッファとして書き込み位置を循環させる）
+        # 後半に前半の複製を持ち、古い順の波形を並べ直さずに連続スライスで取り出す
+        self._display_size = AudioService.SAMPLE_RATE  # 表示するサンプル数
+        self.display_buffer = np.zeros(2 * self._display_size, dtype=np.float32)
+        self._display_write_index = 0  # 次に書き込む位置（= 最も古いサンプルの位置）
+        # 末尾から連続する無音サンプル数（表示サンプル数以上なら全体が無音）
+        self._trailing_zero_samples = self._display_size
+        self._display_dirty = False  # 前回描画から波形が変わったか
+
+        # 表示マスク初期化（波形と同じ長さで確保し、分析結果は先頭へコピーする）
+        self.display_mask = np.zeros(AudioService.SAMPLE_RATE, dtype=bool)
+        self._mask_len = 0  # display_maskのうち有効な長さ
+        # 表示マスクが連続してTrueの区間 [開始, 終了) の一覧（マスク更新時のみ再計算）
+        self._mask_runs = np.empty((0, 2), dtype=np.intp)
+        self._mask_dirty = False  # 前回描画から検出区間が変わったか
+
+        # スペクトラムの縦軸上限（ピークには即追従し、下げる時はゆっくり減衰させる）
+        self._spectrum_ymax = 0.05  # 目標上限
+        self._spectrum_ylim = 0.1  # 現在軸に設定されている上限
+
+        # ブリット用の背景（軸・目盛りなど更新されない部分。Noneなら全体を再描画）
+        self._plot_background = None
 
         # UI初期化
         self._init_tk_variables()
@@ -131,8 +180,11 @@ class SnoreGuardApp:
 
         self.ui = UIBuilder(self)
 
-        # マイクリスト更新
-        self._populate_mic_list()
+        # マイク一覧の反映までは検出開始を無効化
+        self._update_control_state()
+
+        # マイクリスト更新（列挙は時間がかかるため、表示後に別スレッドで実行）
+        self.root.after(0, self._start_device_enumeration)
 
         # UI設定更新は少し遅らせて実行（UI要素が完全に準備されるまで待つ）
         self.root.after(100, self._update_ui_with_settings)
@@ -148,14 +200,15 @@ class SnoreGuardApp:
         self._start_time_scheduler_if_enabled()
         logger.debug("タイムスケジューラー初期化完了")
 
+        # 他スレッドからのログの表示ループ開始
+        self.root.after(LOG_FLUSH_INTERVAL_MS, self._drain_log_queue)
+
         # ウィンドウクローズ時の処理
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
         logger.debug("SnoreGuardApp初期化完了")
 
-        update_thread = threading.Thread(
-            target=self._check_for_updates_background, daemon=True
-        )
-        update_thread.start()
+        # アップデート確認（ネットワーク接続を待つため、少し遅らせて開始）
+        self.root.after(UPDATE_CHECK_DELAY_MS, self._start_update_check)
 
     def _init_tk_variables(self):
         """アプリ内で使用するTkinter変数を初期化"""
@@ -166,6 +219,12 @@ class SnoreGuardApp:
         self.periodicity_status_var = tk.StringVar(value="0 / 0")
         self.rule_setting_vars = {}
         self.detailed_status_vars = {}
+        self._lamp_last_color: dict[str, str] = {}  # ランプごとに最後に設定した色
+        self._log_stamp_second = -1  # ログ時刻表記を作成した秒
+        self._log_stamp = ""  # ログ時刻表記（同じ秒の間は使い回す）
+        self._detail_last_text: dict[str, str] = {}  # 詳細ステータスの表示中テキスト
+        # 最後に反映したコントロール状態（開始ボタン, 文言, 停止ボタン, 入力系）
+        self._control_state: tuple[str, str, str, str] | None = None
 
     def _get_default_settings(self) -> dict:
         """アプリのデフォルト設定値を返す"""
@@ -192,6 +251,10 @@ class SnoreGuardApp:
             logger.debug("初期化中のためスキップ")
             return
 
+        if not self._devices_ready:
+            logger.debug("マイク一覧の取得中のためスキップ")
+            return
+
         selected_mic_name = self.mic_var.get()
         logger.debug(f"選択されたマイク: {selected_mic_name}")
 
@@ -256,7 +319,7 @@ class SnoreGuardApp:
 
             # 分析エンジンを事前初期化
             self._update_progress(40, "分析エンジンを初期化中")
-            # RuleBasedProcessorの初期化時にlibrosaのプリコンパイルが実行される
+            # 特徴量抽出のウォームアップはプロセス内で実行済み
 
             # 音声ストリームを初期化
             self._update_progress(70, "音声ストリームを初期化中")
@@ -335,11 +398,7 @@ class SnoreGuardApp:
 
     # 初期化中のUI状態更新
     def _update_control_state_initializing(self):
-        self.start_button.configure(state="disabled", text="初期化中...")
-        self.stop_button.configure(state="disabled")
-        self.mic_combobox.configure(state="disabled")
-        for _, _, scale in self.rule_setting_vars.values():
-            scale.configure(state="disabled")
+        self._apply_control_state("disabled", "初期化中...", "disabled", "disabled")
 
     def _stop_detection(self):
         """音声検出を停止してシステムをリセット"""
@@ -370,11 +429,7 @@ class SnoreGuardApp:
             pass
 
         # データキューリセット
-        while not self.data_queue.empty():
-            try:
-                self.data_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.data_queue.clear()
 
         # UI状態更新
         self._update_control_state()
@@ -389,35 +444,49 @@ class SnoreGuardApp:
         """システム状態に応じたUIコントロール状態を更新"""
         if self.is_initializing:
             # 初期化中: 全コントロールを無効化
-            self.start_button.configure(state="disabled", text="初期化中...")
-            self.stop_button.configure(state="disabled")
-            self.mic_combobox.configure(state="disabled")
-            for _, _, scale in self.rule_setting_vars.values():
-                scale.configure(state="disabled")
+            self._update_control_state_initializing()
         else:
             # 通常状態: 実行中かどうかで制御
             state = "normal" if not self.is_running else "disabled"
-            self.start_button.configure(
-                state="disabled" if self.is_running else "normal", text="検出開始"
-            )
-            self.stop_button.configure(
-                state="normal" if self.is_running else "disabled"
+            can_start = self._devices_ready and not self.is_running
+            self._apply_control_state(
+                "normal" if can_start else "disabled",
+                "検出開始",
+                "normal" if self.is_running else "disabled",
+                state,
             )
-            self.mic_combobox.configure(state=state)
+
+    def _apply_control_state(
+        self, start_state: str, start_text: str, stop_state: str, input_state: str
+    ):
+        """コントロール状態を反映（前回から変わった項目のみ設定）"""
+        last = self._control_state or (None, None, None, None)
+        if (start_state, start_text) != last[:2]:
+            self.start_button.configure(state=start_state, text=start_text)
+        if stop_state != last[2]:
+            self.stop_button.configure(state=stop_state)
+        if input_state != last[3]:
+            # マイク選択と全スライダーは常に同じ状態のため、まとめて判定
+            self.mic_combobox.configure(state=input_state)
             for _, _, scale in self.rule_setting_vars.values():
-                scale.configure(state=state)
+                scale.configure(state=input_state)
+        self._control_state = (start_state, start_text, stop_state, input_state)
 
     def _update_visuals(self):
         """リアルタイムで音声データと統計をビジュアル更新"""
         if not self.is_running:
             logger.debug("ビジュアル更新をスキップ: 検出停止中")
             return
+        # 最小化・非表示中は描画せず、溜まったデータを捨てて更新間隔を延ばす
+        # （検出自体は音声スレッドで継続し、表示は復帰後1秒以内に追いつく）
+        if self.root.wm_state() in ("iconic", "withdrawn"):
+            self.data_queue.clear()
+            self.root.after(HIDDEN_UPDATE_INTERVAL_MS, self._update_visuals)
+            return
         try:
             # イベント検出後の周期性タイマー処理
-            if self.periodicity_timer_start_time:
-                elapsed = (
-                    datetime.now() - self.periodicity_timer_start_time
-                ).total_seconds()
+            if self.periodicity_timer_start_time is not None:
+                elapsed = time.monotonic() - self.periodicity_timer_start_time
                 # 進捗バーを更新
                 progress = min(
                     1.0, elapsed / self.rule_settings.periodicity_window_seconds
@@ -437,64 +506,184 @@ class SnoreGuardApp:
                     pass
 
             # 新しい音声データがある場合の処理
-            updated = False
-            while not self.data_queue.empty():
-                updated = True
-                data_type, *payload = self.data_queue.get_nowait()
+            # 波形は全サンプルを書き込むが、スペクトラムと分析結果は最新のみ反映する
+            latest_spectrum = None
+            latest_analysis = None
+            viz_chunks = []
+            # 取り出すのはこの時点で溜まっている分だけ（上限はキューの最大長）
+            # 処理中に追加されたデータは次回に回し、メインループを占有しない
+            # （deque.popleftはロック不要のため、キューの差し替えはしない）
+            for _ in range(len(self.data_queue)):
+                data_type, *payload = self.data_queue.popleft()
                 # ビジュアルデータの場合
                 if data_type == "viz":
-                    viz_chunk, spectrum = payload
-                    self.display_buffer = np.roll(self.display_buffer, -len(viz_chunk))
-                    self.display_buffer[-len(viz_chunk) :] = viz_chunk
-                    self.spectrum_line.set_ydata(spectrum)
-                    self.ax_spectrum.set_ylim(0, max(0.05, np.max(spectrum) * 1.2))
+                    viz_chunk, latest_spectrum = payload
+                    viz_chunks.append(viz_chunk)
                 elif data_type == "analysis":
-                    self._process_analysis_data(payload[0])
-            # ビジュアルデータが更新された場合
-            if updated:
+                    latest_analysis = payload[0]
+
+            self._write_visible_chunks(viz_chunks)
+            if latest_spectrum is not None:
+                self.spectrum_line.set_ydata(latest_spectrum)
+                self._update_spectrum_ylim(float(np.max(latest_spectrum)))
+            if latest_analysis is not None:
+                self._process_analysis_data(latest_analysis)
+            # 波形か検出区間が実際に変わった場合のみ再描画
+            # （デジタル無音が続く間は内容が同じため描画しない）
+            if self._display_dirty or self._mask_dirty:
                 self._draw_plots()
 
-        # キューが空の場合
-        except queue.Empty:
-            pass
         finally:
             self.root.after(UPDATE_INTERVAL_MS, self._update_visuals)
 
+    def _update_spectrum_ylim(self, peak: float):
+        """スペクトラムの縦軸上限を更新（変化が1割を超える場合のみ軸を再設定）"""
+        self._spectrum_ymax = max(0.05, peak * 1.2, self._spectrum_ymax * 0.99)
+        if abs(self._spectrum_ymax - self._spectrum_ylim) > self._spectrum_ylim * 0.1:
+            self._spectrum_ylim = self._spectrum_ymax
+            self.ax_spectrum.set_ylim(0, self._spectrum_ylim)
+            # 目盛りが変わるため、次の描画で背景ごと描き直す
+            self._invalidate_plot_background()
+            self._display_dirty = True
+
+    def _write_visible_chunks(self, chunks: list[np.ndarray]):
+        """表示窓に残るチャンクのみリングバッファへ書き込む"""
+        # 後続のチャンクだけで表示窓が埋まる場合、それより前は上書きされるため省く
+        first = len(chunks)
+        remaining = self._display_size
+        while first > 0 and remaining > 0:
+            first -= 1
+            remaining -= len(chunks[first])
+        for chunk in chunks[first:]:
+            self._write_display_samples(chunk)
+
+    def _write_display_samples(self, chunk: np.ndarray):
+        """表示用リングバッファへサンプルを書き込む（チャンク分のみコピー）"""
+        buffer = self.display_buffer
+        size = self._display_size
+        n = len(chunk)
+        if chunk.any():
+            self._trailing_zero_samples = int(np.argmax(chunk[::-1] != 0))
+            self._display_dirty = True
+        else:
+            # 全体が無音のバッファに無音を書き足しても表示は変わらない
+            if self._trailing_zero_samples < size:
+                self._display_dirty = True
+            self._trailing_zero_samples += n
+
+        if n >= size:
+            buffer[:size] = chunk[-size:]
+            buffer[size:] = chunk[-size:]
+            self._display_write_index = 0
+            return
+
+        # 前半と、その複製である後半の両方へ書き込む
+        start = self._display_write_index
+        end = start + n
+        if end <= size:
+            buffer[start:end] = chunk
+            buffer[start + size : end + size] = chunk
+        else:
+            # 末尾で折り返す分は先頭へ書き込む
+            first = size - start
+            buffer[start:size] = chunk[:first]
+            buffer[start + size :] = chunk[:first]
+            buffer[: n - first] = chunk[first:]
+            buffer[size : size + n - first] = chunk[first:]
+        self._display_write_index = end % size
+
+    def _ordered_display_buffer(self) -> np.ndarray:
+        """リングバッファを古い順に並べた波形を取得（コピーしないビュー）"""
+        start = self._display_write_index
+        return self.display_buffer[start : start + self._display_size]
+
     def _process_analysis_data(self, res: dict):
         """分析データ処理"""
-        self.display_mask = res.get("final_mask_frames", np.zeros(1, dtype=bool))
-        pass_masks = res.get("pass_masks")
+        mask = res.get("final_mask_frames")
+        if mask is None:
+            self._mask_len = 0
+        else:
+            n = min(len(mask), len(self.display_mask))
+            np.copyto(self.display_mask[:n], mask[:n])
+            self._mask_len = n
+        # 区間の検出は描画ごとではなく、マスクが変わる分析結果ごとに1回だけ行う
+        mask_runs = self._find_mask_runs(self.display_mask[: self._mask_len])
+        if not np.array_equal(mask_runs, self._mask_runs):
+            self._mask_runs = mask_runs
+            self._mask_dirty = True
+        pass_counts = res.get("pass_counts")
         try:
-            if pass_masks and self.rule_status_vars is not None:
+            if pass_counts and self.rule_status_vars is not None:
                 for name, lamp_widget in self.rule_status_vars.items():
-                    mask = pass_masks.get(name)
-                    is_pass = np.any(mask) if mask is not None else False
-                    # ランプの色を更新
-                    pass_color = "#2ECC71"
-                    fail_color = "#E74C3C"
-
-                    lamp_widget.configure(
-                        fg_color=pass_color if is_pass else fail_color
-                    )
+                    # 1フレームでも通過していれば合格
+                    is_pass = pass_counts.get(name, 0) > 0
+                    color = "#2ECC71" if is_pass else "#E74C3C"
+                    # 色が変わる場合のみランプを更新（Tkへの無駄な再設定を避ける）
+                    if self._lamp_last_color.get(name) != color:
+                        lamp_widget.configure(fg_color=color)
+                        self._lamp_last_color[name] = color
         except (AttributeError, NameError):
             pass
         self._update_detailed_status(res)
 
     def _draw_plots(self):
         """プロット更新"""
-        self.waveform_line.set_ydata(self.display_buffer)
-        self.waveform_fill.remove()
-        mask_len = min(len(self.waveform_x), len(self.display_mask))
-        self.waveform_fill = self.ax_waveform.fill_between(
-            self.waveform_x[:mask_len],
-            self.display_buffer[:mask_len],
-            0,
-            where=self.display_mask[:mask_len],
-            color="orange",
-            alpha=0.5,
-            interpolate=True,
+        self._display_dirty = False
+        self._mask_dirty = False
+        waveform = self._ordered_display_buffer()
+        self.waveform_line.set_ydata(waveform)
+        # 塗りつぶしは作り直さず、既存のコレクションの頂点だけを差し替える
+        self.waveform_fill.set_verts(
+            self._mask_fill_polygons(self.waveform_x, waveform, self._mask_runs)
+        )
+        if self._plot_background is None:
+            # 全体を描画（draw_eventで背景の取得と線の描画が行われる）
+            self.plot_canvas.draw()
+            return
+        # 背景を復元し、変化する線と塗りつぶしだけを描いて転送する
+        self.plot_canvas.restore_region(self._plot_background)
+        self._draw_animated_artists()
+        self.plot_canvas.blit(self.fig.bbox)
+
+    def _invalidate_plot_background(self, event=None):
+        """保存済みの背景を破棄（次の描画で全体を再描画）"""
+        self._plot_background = None
+
+    def _on_plot_draw(self, event):
+        """全体描画時に背景を保存し、線と塗りつぶしを重ねる"""
+        self._plot_background = self.plot_canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated_artists()
+
+    def _draw_animated_artists(self):
+        """animatedに設定した線と塗りつぶしを描画"""
+        self.ax_waveform.draw_artist(self.waveform_fill)
+        self.ax_waveform.draw_artist(self.waveform_line)
+        self.ax_spectrum.draw_artist(self.spectrum_line)
+
+    @staticmethod
+    def _find_mask_runs(mask: np.ndarray) -> np.ndarray:
+        """マスクが連続してTrueの区間を (開始, 終了) の組の配列として取得"""
+        # 両端を0で挟んだ差分の非ゼロ位置は、開始と終了が交互に並ぶ
+        edges = np.flatnonzero(
+            np.diff(np.asarray(mask, dtype=bool).view(np.int8), prepend=0, append=0)
         )
-        self.plot_canvas.draw_idle()
+        return edges.reshape(-1, 2)
+
+    @staticmethod
+    def _mask_fill_polygons(
+        x: np.ndarray, y: np.ndarray, runs: np.ndarray
+    ) -> list[np.ndarray]:
+        """区間ごとに、波形と0の間を塗る多角形を作成"""
+        polygons = []
+        for start, end in runs:
+            # 基線上の始点 → 波形 → 基線上の終点
+            polygon = np.zeros((end - start + 2, 2))
+            polygon[1:-1, 0] = x[start:end]
+            polygon[1:-1, 1] = y[start:end]
+            polygon[0, 0] = x[start]
+            polygon[-1, 0] = x[end - 1]
+            polygons.append(polygon)
+        return polygons
 
     def on_snore_detected_callback(self):
         """いびき検出コールバック"""
@@ -509,7 +698,10 @@ class SnoreGuardApp:
         self.add_log("いびきを検出しました！", "detection")
         self.status_label_var.set("イビキ検出!")
         if self.notification_var.get():
-            winsound.Beep(1000, 200)
+            # Beepは鳴り終わるまで戻らないため、UIを止めないよう別スレッドで鳴らす
+            threading.Thread(
+                target=winsound.Beep, args=(1000, 200), daemon=True
+            ).start()
         if self.auto_mute_var.get():
             self._trigger_vrchat_mute()
         self.root.after(
@@ -546,18 +738,46 @@ class SnoreGuardApp:
         value = round(float(value_str)) if is_int else float(value_str)
         label_var.set(f"{value}" if is_int else f"{value:.3f}")
         setattr(self.rule_settings, name, value)
+        # 保存用の辞書も同時に更新（保存のたびにasdictで変換し直さない）
+        self.app_settings.setdefault("rule_settings", {})[name] = value
 
     def _update_rule_settings_ui(self):
         """ルール設定UI更新"""
         for name, (var, label_var, _) in self.rule_setting_vars.items():
             value = getattr(self.rule_settings, name)
             var.set(value)
-            label_var.set(f"{value}" if isinstance(value, int) else f"{value:.3f}")
+            label_var.set(RULE_SETTING_LABEL_FORMATS[name].format(value))
 
-    def _populate_mic_list(self):
+    def _start_device_enumeration(self):
+        """デバイス列挙スレッドを開始"""
+        threading.Thread(target=self._enumerate_devices, daemon=True).start()
+
+    def _enumerate_devices(self):
+        """デバイス情報を取得し、メインスレッドへ渡す（ワーカースレッドで実行）"""
+        try:
+            result = {
+                "all_devices": list(sd.query_devices()),
+                # ホストAPI名はデバイスごとに問い合わせず1回だけ取得
+                "hostapi_names": [api.get("name", "") for api in sd.query_hostapis()],
+                "default_device_id": self._get_default_device_id(),
+            }
+        except Exception as e:
+            ThreadSafeHandler.safe_after(self.root, self._handle_mic_list_error, e)
+            return
+        ThreadSafeHandler.safe_after(self.root, self._apply_mic_list, result)
+
+    def _apply_mic_list(self, result: dict):
+        """取得したデバイス情報でマイクリストを更新（メインスレッドで実行）"""
+        try:
+            self._populate_mic_list(result)
+        finally:
+            self._devices_ready = True
+            self._update_control_state()
+
+    def _populate_mic_list(self, result: dict):
         """マイクリスト更新"""
         try:
-            all_devices = sd.query_devices()
+            all_devices = result["all_devices"]
             input_devices_info = self._get_input_devices(all_devices)
 
             if not input_devices_info:
@@ -567,10 +787,10 @@ class SnoreGuardApp:
             self.input_devices = {}
 
             # 既定デバイスを追加
-            self._add_default_device(all_devices)
+            self._add_default_device(all_devices, result["default_device_id"])
 
             # 個別デバイスを追加
-            self._add_individual_devices(input_devices_info)
+            self._add_individual_devices(input_devices_info, result["hostapi_names"])
 
             # UIを更新
             self._update_mic_combobox()
@@ -586,10 +806,9 @@ class SnoreGuardApp:
             if d.get("max_input_channels", 0) > 0
         ]
 
-    def _add_default_device(self, all_devices):
+    def _add_default_device(self, all_devices, default_device_id):
         """既定デバイスを追加"""
         try:
-            default_device_id = self._get_default_device_id()
             if self._is_valid_default_device(default_device_id, all_devices):
                 device_info = all_devices[default_device_id]
                 if self._should_add_device(device_info):
@@ -639,7 +858,7 @@ class SnoreGuardApp:
             "max_input_channels", 0
         ) > 0 and "Microsoft Sound Mapper" not in device_info.get("name", "")
 
-    def _add_individual_devices(self, input_devices_info):
+    def _add_individual_devices(self, input_devices_info, hostapi_names):
         """個別のマイクデバイスを追加"""
         seen_device_names = set()
         default_device_id = self.input_devices.get("既定のデバイス")
@@ -654,7 +873,7 @@ class SnoreGuardApp:
                 if device_name in seen_device_names:
                     continue
 
-                if self._is_preferred_api(device_info, device_name):
+                if self._is_preferred_api(device_info, device_name, hostapi_names):
                     seen_device_names.add(device_name)
                     self.input_devices[device_name] = device_id
 
@@ -668,12 +887,10 @@ class SnoreGuardApp:
             or "Microsoft Sound Mapper" in device_info.get("name", "")
         )
 
-    def _is_preferred_api(self, device_info, device_name):
+    def _is_preferred_api(self, device_info, device_name, hostapi_names):
         """優先されるAPIかチェック"""
         try:
-            hostapi_index = device_info.get("hostapi", 0)
-            hostapi_info = sd.query_hostapis()[hostapi_index]
-            api_name = hostapi_info.get("name", "")
+            api_name = hostapi_names[device_info.get("hostapi", 0)]
 
             # WASAPI以外で既に同名デバイスがある場合はスキップ
             if "WASAPI" not in api_name:
@@ -711,6 +928,8 @@ class SnoreGuardApp:
 
     def _handle_mic_list_error(self, error):
         """マイクリストエラーを処理"""
+        self._devices_ready = True  # 一覧は空のまま確定（開始時にエラーを表示）
+        self._update_control_state()
         error_msg = f"マイクデバイスの取得に失敗: {error}"
         self.add_log(error_msg, "error")
         messagebox.showerror(
@@ -733,13 +952,11 @@ class SnoreGuardApp:
             self.auto_mute_var.set(self.app_settings.get("auto_mute_on_snore", True))
         if rule_settings_dict := self.app_settings.get("rule_settings"):
             for key, value in rule_settings_dict.items():
-                try:
-                    if getattr(self.rule_settings, key, None) is not None or hasattr(
-                        self.rule_settings, key
-                    ):
-                        setattr(self.rule_settings, key, value)
-                except (AttributeError, TypeError):
-                    pass
+                # 旧バージョンの不明なキーは無視
+                if key in RULE_SETTING_FIELDS:
+                    setattr(self.rule_settings, key, value)
+        # 保存用の辞書を現在の設定と揃える（以降はスライダー変更時に項目ごとに更新）
+        self.app_settings["rule_settings"] = asdict(self.rule_settings)
         self._update_rule_settings_ui()
         self._update_scheduler_settings_ui()
         self._update_control_state()
@@ -751,8 +968,8 @@ class SnoreGuardApp:
         self.app_settings["audio_notification_enabled"] = self.notification_var.get()
         if self.HAS_OSC:
             self.app_settings["auto_mute_on_snore"] = self.auto_mute_var.get()
-        self.app_settings["rule_settings"] = asdict(self.rule_settings)
-        self.settings_manager.save(self.app_settings)
+        # スライダー操作中にUIを止めないよう、ファイル書き込みはバックグラウンドで行う
+        self.settings_manager.save_async(self.app_settings)
 
         # VRChatへ状態フィードバック（無限ループ防止）
         if send_feedback:
@@ -775,7 +992,7 @@ class SnoreGuardApp:
             self._update_scheduler_settings_ui()
 
             # 設定を保存
-            self.settings_manager.save(self.app_settings)
+            self.settings_manager.save_async(self.app_settings)
 
             self.add_log("設定をデフォルト値にリセットしました", "info")
 
@@ -789,21 +1006,21 @@ class SnoreGuardApp:
         if not results:
             return
 
-        def get_last(key):
-            return results[key][-1] if key in results and len(results[key]) > 0 else 0
-
         for key, var in self.detailed_status_vars.items():
-            if key == "energy":
-                var.configure(text=f"{get_last('rms'):.4f}")
-            elif key == "f0_confidence":
-                var.configure(text=f"{get_last('voiced_probs'):.3f}")
-            elif key == "spectral_centroid":
-                var.configure(text=f"{get_last('spectral_centroid'):.1f}")
-            elif key == "zcr":
-                var.configure(text=f"{get_last('zcr'):.4f}")
-            elif key == "f0":
-                f0 = get_last("f0")
-                var.configure(text=f"{f0:.1f} Hz" if f0 > 0 else "--")
+            result_key, fmt = DETAILED_STATUS_FORMATS.get(key, (None, None))
+            if result_key is None:
+                continue
+            values = results.get(result_key)
+            value = values[-1] if values is not None and len(values) > 0 else 0
+            # 無声（F0なし）や無音で未計算（NaN）の場合は値の代わりに "--" を表示
+            if np.isnan(value) or (key == "f0" and value <= 0):
+                text = "--"
+            else:
+                text = fmt.format(value)
+            # 表示が変わる場合のみラベルを更新
+            if self._detail_last_text.get(key) != text:
+                var.configure(text=text)
+                self._detail_last_text[key] = text
 
         self.periodicity_status_var.set(
             f"{res.get('recent_events_count', 0)} / {self.rule_settings.periodicity_event_count}"
@@ -812,23 +1029,47 @@ class SnoreGuardApp:
 
     def add_log(self, message: str, level: str = "info"):
         """ログ追加"""
+        self.add_log_lines([message], level)
+
+    def add_log_lines(self, messages: list[str], level: str = "info"):
+        """複数行のログをまとめて追加（ウィジェットへの挿入は1回）"""
         try:
             if not self.log_text or not self.log_text.winfo_exists():
                 return
         except (AttributeError, NameError, tk.TclError):
             return
         try:
-            log_line = f"[{datetime.now().strftime('%H:%M:%S')}] {message}\n"
+            stamp = self._log_timestamp()
+            log_lines = "".join(f"[{stamp}] {message}\n" for message in messages)
             self.log_text.configure(state="normal")
-            self.log_text.insert(tk.END, log_line)
+            self.log_text.insert(tk.END, log_lines)
             self.log_text.see(tk.END)
             self.log_text.configure(state="disabled")
         except (tk.TclError, RuntimeError):
             pass
 
+    def _log_timestamp(self) -> str:
+        """ログ用の時刻表記を取得（同じ秒内の連続ログでは整形を省略）"""
+        now = time.time()
+        second = int(now)
+        if second != self._log_stamp_second:
+            self._log_stamp_second = second
+            self._log_stamp = time.strftime("%H:%M:%S", time.localtime(now))
+        return self._log_stamp
+
     def add_log_threadsafe(self, message: str, level: str = "info"):
-        """スレッドセーフなログ追加"""
-        ThreadSafeHandler.safe_log(self.root, self.add_log, message, level)
+        """スレッドセーフなログ追加（キューに積み、メインスレッドでまとめて表示）"""
+        self._log_queue.append(message)
+
+    def _drain_log_queue(self):
+        """溜まったログを1回の挿入でまとめて表示"""
+        try:
+            # 取り出すのはこの時点で溜まっている分だけ
+            messages = [self._log_queue.popleft() for _ in range(len(self._log_queue))]
+            if messages:
+                self.add_log_lines(messages)
+        finally:
+            self.root.after(LOG_FLUSH_INTERVAL_MS, self._drain_log_queue)
 
     def _on_closing(self):
         """終了処理"""
@@ -845,6 +1086,8 @@ class SnoreGuardApp:
             logger.debug("タイムスケジューラー停止完了")
 
         self._save_app_settings()
+        # 書き込み待ちの設定を終了前に確実に保存
+        self.settings_manager.flush()
         logger.debug("設定保存完了")
         self.root.destroy()
         logger.debug("アプリケーション終了処理完了")
@@ -854,7 +1097,10 @@ class SnoreGuardApp:
         ThreadSafeHandler.safe_after(
             self.root, self._update_osc_status_ui, is_connected, message
         )
-        if is_connected and not hasattr(self, "_initial_feedback_sent"):
+        if is_connected:
+            # 新しい接続先には前回と同じ状態でも送り直す
+            self._last_feedback_state = None
+        if is_connected and not self._initial_feedback_sent:
             ThreadSafeHandler.safe_after(self.root, self._send_delayed_feedback)
 
     def _update_osc_status_ui(self, is_connected: bool, message: str):
@@ -876,6 +1122,11 @@ class SnoreGuardApp:
 
     def on_vrchat_mute_change(self, is_muted: bool):
         """VRChatミュート状態変更通知"""
+        # 前回渡した状態と同じで同期待ちでもなければ、メインスレッドへ渡さない
+        # （反映前の通知があり得るため、is_vrchat_mutedではなく渡した値と比較）
+        if is_muted == self._last_mute_notified and not self.is_awaiting_mute_sync:
+            return
+        self._last_mute_notified = is_muted
         ThreadSafeHandler.safe_after(
             self.root, self._update_internal_mute_state, is_muted
         )
@@ -903,11 +1154,13 @@ class SnoreGuardApp:
                 self.add_log("ミュート同期がタイムアウトしました。", "warning")
             self.is_awaiting_mute_sync = False
 
+    def _start_update_check(self):
+        """アップデート確認スレッドを開始（通信中のみスレッドを使う）"""
+        threading.Thread(target=self._check_for_updates_background, daemon=True).start()
+
     def _check_for_updates_background(self):
         """バックグラウンドでアップデートを確認する"""
         logger.info("バックグラウンドでアップデートチェックを実行します。")
-        # ネットワーク接続を待つため、少し待機
-        time.sleep(5)
         update_info = self.updater.check_for_updates()
         if update_info:
             # UIの更新はメインスレッドで行う必要があるため、ThreadSafeHandler経由で呼び出す
@@ -918,16 +1171,8 @@ class SnoreGuardApp:
     def _show_update_notification(self, update_info: dict):
         """アップデート通知UIを表示する（メインスレッドから呼び出される）"""
         try:
-            # UI要素が存在するか確認
-            if not all(
-                hasattr(self, attr)
-                for attr in [
-                    "update_label",
-                    "update_button",
-                    "booth_button",
-                    "update_notification_frame",
-                ]
-            ):
+            # UI要素が作成済みか確認（作成時に立てたフラグで判定）
+            if not self._update_ui_ready:
                 logger.warning("アップデート通知用のUI要素が見つかりません。")
                 return
 
@@ -975,17 +1220,15 @@ class SnoreGuardApp:
 
         if scheduler_settings.get("enabled", False):
             try:
-                from datetime import time as dt_time
-
-                start_time_str = scheduler_settings.get("start_time", "22:00")
-                end_time_str = scheduler_settings.get("end_time", "06:00")
+                defaults = DEFAULT_SCHEDULER_SETTINGS
+                start_time_str = scheduler_settings.get(
+                    "start_time", defaults.start_time
+                )
+                end_time_str = scheduler_settings.get("end_time", defaults.end_time)
 
                 # 時刻文字列をパース
-                start_hour, start_minute = map(int, start_time_str.split(":"))
-                end_hour, end_minute = map(int, end_time_str.split(":"))
-
-                start_time = dt_time(start_hour, start_minute)
-                end_time = dt_time(end_hour, end_minute)
+                start_time = parse_hhmm(start_time_str)
+                end_time = parse_hhmm(end_time_str)
 
                 # スケジューラー設定
                 self.time_scheduler.configure(
@@ -1016,14 +1259,9 @@ class SnoreGuardApp:
             self._save_app_settings()
 
             if enabled:
-                from datetime import time as dt_time
-
                 # 時刻文字列をパース
-                start_hour, start_minute = map(int, start_time.split(":"))
-                end_hour, end_minute = map(int, end_time.split(":"))
-
-                start_time_obj = dt_time(start_hour, start_minute)
-                end_time_obj = dt_time(end_hour, end_minute)
+                start_time_obj = parse_hhmm(start_time)
+                end_time_obj = parse_hhmm(end_time)
 
                 # スケジューラー設定更新
                 self.time_scheduler.configure(
@@ -1045,18 +1283,20 @@ class SnoreGuardApp:
     def _update_scheduler_settings_ui(self):
         """タイムスケジューラー設定UIを更新"""
         try:
-            scheduler_settings = self.app_settings.get(
-                "time_scheduler", asdict(TimeSchedulerSettings())
-            )
-
-            # 有効/無効設定
-            if hasattr(self, "scheduler_enabled_var"):
-                self.scheduler_enabled_var.set(scheduler_settings.get("enabled", False))
+            defaults = DEFAULT_SCHEDULER_SETTINGS
+            # 各項目は個別にデフォルト値で補うため、辞書全体の既定値は作らない
+            scheduler_settings = self.app_settings.get("time_scheduler", {})
+
+            # 有効/無効設定（時刻変数と同じカードで作成される）
+            if self._scheduler_time_vars is not None:
+                self.scheduler_enabled_var.set(
+                    scheduler_settings.get("enabled", defaults.enabled)
+                )
 
             # 時刻設定の読み込み（2桁フォーマット対応）
             self._set_time_spinboxes(
-                scheduler_settings.get("start_time", "22:00"),
-                scheduler_settings.get("end_time", "06:00"),
+                scheduler_settings.get("start_time", defaults.start_time),
+                scheduler_settings.get("end_time", defaults.end_time),
             )
 
         except Exception as e:
@@ -1064,25 +1304,22 @@ class SnoreGuardApp:
 
     def _set_time_spinboxes(self, start_time: str, end_time: str):
         """時刻スピンボックスに値を設定（2桁フォーマット保証）"""
+        time_vars = self._scheduler_time_vars
+        if time_vars is None:
+            return
         try:
-            # 開始時刻
-            start_hour, start_minute = start_time.split(":")
-            if hasattr(self, "scheduler_start_hour_var"):
-                self.scheduler_start_hour_var.set(f"{int(start_hour):02d}")
-            if hasattr(self, "scheduler_start_minute_var"):
-                self.scheduler_start_minute_var.set(f"{int(start_minute):02d}")
-
-            # 終了時刻
-            end_hour, end_minute = end_time.split(":")
-            if hasattr(self, "scheduler_end_hour_var"):
-                self.scheduler_end_hour_var.set(f"{int(end_hour):02d}")
-            if hasattr(self, "scheduler_end_minute_var"):
-                self.scheduler_end_minute_var.set(f"{int(end_minute):02d}")
+            start = parse_hhmm(start_time)
+            end = parse_hhmm(end_time)
+            start_hour_var, start_minute_var, end_hour_var, end_minute_var = time_vars
+            start_hour_var.set(f"{start.hour:02d}")
+            start_minute_var.set(f"{start.minute:02d}")
+            end_hour_var.set(f"{end.hour:02d}")
+            end_minute_var.set(f"{end.minute:02d}")
 
         except (ValueError, AttributeError) as e:
             logger.warning(f"時刻設定パース失敗、デフォルト値を使用: {e}")
             # デフォルト値（TimeSchedulerSettingsから取得）
-            defaults = TimeSchedulerSettings()
+            defaults = DEFAULT_SCHEDULER_SETTINGS
             self._set_time_spinboxes(defaults.start_time, defaults.end_time)
 
     # ===== 自動キャリブレーション関連メソッド =====
@@ -1120,11 +1357,27 @@ class SnoreGuardApp:
             # 設定を更新
             self.rule_settings = optimal_settings
             self.audio_service.rule_settings = optimal_settings
+            self.app_settings["rule_settings"] = asdict(optimal_settings)
+
+            # UI・保存・ログへの反映はモーダルを閉じた後、アイドル時にまとめて行う
+            self.root.after_idle(
+                self._apply_calibration_result,
+                old_settings,
+                optimal_settings,
+                confidence,
+            )
 
+        except Exception as e:
+            logger.error(f"キャリブレーション結果適用エラー: {e}", exc_info=True)
+            self.add_log(f"キャリブレーション結果適用エラー: {e}", "error")
+
+    def _apply_calibration_result(self, old_settings, optimal_settings, confidence):
+        """キャリブレーション結果をUI・設定ファイル・ログへ反映"""
+        try:
             # UI設定も更新
             self._apply_settings_to_ui(optimal_settings)
 
-            # 設定を保存
+            # 設定を保存（書き込みはバックグラウンドで行われる）
             self._save_app_settings()
 
             # 変更内容をログに表示
@@ -1141,52 +1394,18 @@ class SnoreGuardApp:
     def _log_calibration_changes(self, old_settings, new_settings):
         """キャリブレーション変更内容をログに表示"""
         try:
-            from dataclasses import fields
-
-            self.add_log("=== キャリブレーション結果 ===", "info")
-
-            # 設定項目の日本語名マッピング
-            field_names = {
-                "energy_threshold": "エネルギー閾値",
-                "f0_confidence_threshold": "F0信頼度閾値",
-                "spectral_centroid_threshold": "スペクトル重心閾値",
-                "zcr_threshold": "ZCR閾値",
-                "min_duration_seconds": "最小持続時間",
-                "max_duration_seconds": "最大持続時間",
-                "f0_min_hz": "F0最小値",
-                "f0_max_hz": "F0最大値",
-                "periodicity_event_count": "周期イベント数",
-                "periodicity_window_seconds": "周期ウィンドウ",
-                "min_event_interval_seconds": "最小イベント間隔",
-                "max_event_interval_seconds": "最大イベント間隔",
-            }
-
-            changes_found = False
-
-            for field in fields(old_settings):
-                field_name = field.name
-                old_value = getattr(old_settings, field_name)
-                new_value = getattr(new_settings, field_name)
-
-                # 値が変更された場合のみ表示
-                if abs(old_value - new_value) > 1e-6:  # 浮動小数点数の比較
-                    changes_found = True
-                    display_name = field_names.get(field_name, field_name)
+            lines = ["=== キャリブレーション結果 ==="]
 
-                    # 値の形式を整える
-                    if isinstance(old_value, float):
-                        old_str = f"{old_value:.4f}".rstrip("0").rstrip(".")
-                        new_str = f"{new_value:.4f}".rstrip("0").rstrip(".")
-                    else:
-                        old_str = str(old_value)
-                        new_str = str(new_value)
+            changes = calibration_changes(old_settings, new_settings)
+            for display_name, old_str, new_str in changes:
+                lines.append(f"  {display_name}: {old_str} → {new_str}")
 
-                    self.add_log(f"  {display_name}: {old_str} → {new_str}", "info")
+            if not changes:
+                lines.append("  変更された設定項目はありません")
 
-            if not changes_found:
-                self.add_log("  変更された設定項目はありません", "info")
-
-            self.add_log("========================", "info")
+            lines.append("========================")
+            # 行ごとに挿入せず、まとめて1回で追加
+            self.add_log_lines(lines, "info")
 
         except Exception as e:
             logger.error(f"変更内容ログ表示エラー: {e}", exc_info=True)
@@ -1194,17 +1413,11 @@ class SnoreGuardApp:
     def _apply_settings_to_ui(self, settings: RuleSettings):
         """設定をUIに適用"""
         try:
-            settings_dict = asdict(settings)
-            for name, value in settings_dict.items():
-                if name in self.rule_setting_vars:
-                    var, label_var, slider = self.rule_setting_vars[name]
-                    var.set(value)
-
-                    # ラベル更新
-                    if isinstance(value, int):
-                        label_var.set(f"{value}")
-                    else:
-                        label_var.set(f"{value:.3f}")
+            for name, (var, label_var, _) in self.rule_setting_vars.items():
+                value = getattr(settings, name)
+                var.set(value)
+                # ラベル更新
+                label_var.set(RULE_SETTING_LABEL_FORMATS[name].format(value))
 
         except Exception as e:
             logger.error(f"UI設定適用エラー: {e}", exc_info=True)
@@ -1243,7 +1456,7 @@ class SnoreGuardApp:
 
     def _send_initial_status_feedback(self):
         """初期化時の状態フィードバック（1回限り）"""
-        if hasattr(self, "_initial_feedback_sent"):
+        if self._initial_feedback_sent:
             return
 
         self._initial_feedback_sent = True
@@ -1261,25 +1474,23 @@ class SnoreGuardApp:
             if not self.HAS_OSC or not self.vrc_handler:
                 return
 
-            feedback_data = [
-                (
-                    "/avatar/parameters/SnoreGuard/ToggleDetection",
-                    bool(self.is_running),
-                ),
-                (
-                    "/avatar/parameters/SnoreGuard/SetNotification",
-                    bool(self.notification_var.get()),
-                ),
-                (
-                    "/avatar/parameters/SnoreGuard/SetAutoMute",
-                    bool(self.auto_mute_var.get() if self.HAS_OSC else False),
-                ),
-            ]
-
-            for address, value in feedback_data:
-                self.vrc_handler.send_feedback(address, value)
-
-            logger.debug("状態フィードバック送信完了")
+            # is_runningとBooleanVar.get()はいずれもboolのため変換不要
+            state = (
+                self.is_running,
+                self.notification_var.get(),
+                self.auto_mute_var.get() if self.HAS_OSC else False,
+            )
+            # 前回送信した状態から変化がなければ送信しない
+            if state == self._last_feedback_state:
+                logger.debug("状態フィードバック省略: 変化なし")
+                return
+
+            feedback_data = list(zip(FEEDBACK_OSC_ADDRESSES, state))
+
+            # 1パケットにまとめて送信（送信できた場合のみ状態を記録）
+            if self.vrc_handler.send_feedback_bundle(feedback_data):
+                self._last_feedback_state = state
+                logger.debug("状態フィードバック送信完了")
 
         except Exception as e:
             logger.error(f"状態フィードバック送信エラー: {e}", exc_info=True)
@@ -1,9 +1,11 @@
 import logging
 import threading
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 import numpy as np
 import sounddevice as sd
+from scipy import fft as sp_fft
 from core.rule_processor import RuleBasedProcessor
 
 logger = logging.getLogger(__name__)
@@ -43,6 +45,11 @@ class AudioService:
         )  # ルールベースプロセッサ
         self.is_running = False  # 実行中フラグ
         self._thread: threading.Thread | None = None  # スレッド
+        # 分析専用ワーカー（1スレッドのためチャンク順序とプロセッサ内部状態を保つ）
+        self._analysis_executor: ThreadPoolExecutor | None = None
+        self._pending_analysis: Future | None = None  # 実行中の分析
+        # チャンクを破棄した場合、次の分析前にフィルター状態を捨てる（ワーカーが参照）
+        self._stream_gap = False
         self.stream: sd.InputStream | None = None  # ストリーム
 
         # バッファの事前割り当て
@@ -56,7 +63,7 @@ class AudioService:
         self._spectrum_buffer = np.zeros(
             self.N_FFT // 2 + 1, dtype=np.float32
         )  # スペクトラムバッファ
-        self._fft_buffer = np.zeros(self.N_FFT, dtype=np.float64)  # FFTバッファ
+        self._fft_buffer = np.zeros(self.N_FFT, dtype=np.float32)  # FFTバッファ
 
         logger.debug(
             f"AudioService初期化完了 - SR:{self.SAMPLE_RATE}, FFT:{self.N_FFT}"
@@ -89,6 +96,11 @@ class AudioService:
 
         self.is_running = True  # 実行中フラグをセット
         self._buffer_size = 0  # バッファサイズをリセット
+        self._stream_gap = False
+        self.processor.reset_stream_state()  # 前回ストリームのフィルター状態を破棄
+        self._analysis_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="AudioService-Analysis"
+        )
         logger.debug("検出スレッド作成中")
 
         self._thread = threading.Thread(
@@ -109,6 +121,17 @@ class AudioService:
             if self._thread.is_alive():
                 logger.warning("検出スレッドが正常に終了しませんでした")
         self._thread = None
+
+        # 実行中の分析の完了は最大1秒だけ待つ
+        # （分析中のコールバックがメインスレッドを待つため、無期限に待つと固まる）
+        if self._analysis_executor:
+            self._analysis_executor.shutdown(wait=False, cancel_futures=True)
+            if self._pending_analysis:
+                done, _ = wait([self._pending_analysis], timeout=1.0)
+                if not done:
+                    logger.warning("分析ワーカーが時間内に終了しませんでした")
+        self._analysis_executor = None
+        self._pending_analysis = None
         self._buffer_size = 0  # バッファサイズをリセット
         logger.info("AudioService停止完了")
 
@@ -160,13 +183,12 @@ class AudioService:
             logger.warning("オーディオバッファオーバーフロー")
             self.log_callback("オーディオバッファがオーバーフローしました。", "warning")
 
-        # データを平坦化
-        flat_chunk = viz_chunk.flatten()
+        # データを平坦化（read()は毎回新しい配列を返すためコピー不要）
+        flat_chunk = viz_chunk.reshape(-1)
 
         # 可視化用データのキューイング
         spectrum = self._calculate_spectrum_optimized(flat_chunk)
-        if not self.data_queue.full():
-            self.data_queue.put(("viz", flat_chunk, spectrum))
+        self.data_queue.append(("viz", flat_chunk, spectrum))
 
         # 分析用データの処理（最適化版）
         analysis_chunk_size = int(self.SAMPLE_RATE * self.ANALYSIS_CHUNK_DURATION_S)
@@ -185,14 +207,10 @@ class AudioService:
 
         # バッファが分析チャンクサイズ以上になった場合
         if self._buffer_size >= analysis_chunk_size:
-            analysis_chunk = self.analysis_buffer[:analysis_chunk_size]
-            logger.debug(f"音声分析実行 - chunk_size: {len(analysis_chunk)}")
-            analysis_result_dict = self.processor.process_audio_chunk(analysis_chunk)
-            if analysis_result_dict and not self.data_queue.full():
-                self.data_queue.put(("analysis", analysis_result_dict))
-                logger.debug("分析結果をキューに追加")
-            elif self.data_queue.full():
-                logger.debug("データキューが満杯")
+            # 分析はワーカーで行い、読み込みループは次のブロックの受信を続ける
+            # （バッファはこの後詰め直すため、渡すチャンクはコピーする）
+            analysis_chunk = self.analysis_buffer[:analysis_chunk_size].copy()
+            self._submit_analysis(analysis_chunk)
 
             # バッファから処理済みデータを削除
             remaining_size = self._buffer_size - analysis_chunk_size
@@ -202,24 +220,62 @@ class AudioService:
                 ]
             self._buffer_size = remaining_size
 
+    def _submit_analysis(self, analysis_chunk: np.ndarray):
+        """分析チャンクをワーカーへ投入"""
+        if not self._analysis_executor:
+            return
+        # 前チャンクの分析が終わっていない場合は投入せず破棄する
+        # （ワーカーのキューが際限なく伸び、表示と検出が遅れ続けるのを防ぐ）
+        if self._pending_analysis and not self._pending_analysis.done():
+            # 破棄した区間をまたいでフィルター・フレームがつながらないようにする
+            self._stream_gap = True
+            logger.warning("前チャンクの分析が未完了のため、チャンクを破棄")
+            self.log_callback(
+                "分析が追いつかないため、音声チャンクを1つ破棄しました。", "warning"
+            )
+            return
+        logger.debug(f"音声分析投入 - chunk_size: {len(analysis_chunk)}")
+        self._pending_analysis = self._analysis_executor.submit(
+            self._run_analysis, analysis_chunk
+        )
+
+    def _run_analysis(self, analysis_chunk: np.ndarray):
+        """分析を実行し、結果をキューに追加（ワーカースレッドで実行）"""
+        if self._stream_gap:
+            self._stream_gap = False
+            self.processor.reset_stream_state()
+            logger.debug("チャンク破棄後のためストリーム状態をリセット")
+        try:
+            analysis_result_dict = self.processor.process_audio_chunk(analysis_chunk)
+        except Exception as e:
+            logger.error(f"音声分析でエラー発生: {e}", exc_info=True)
+            self.log_callback(f"音声分析でエラーが発生しました: {e}", "error")
+            return
+
+        if analysis_result_dict:
+            # 満杯の場合は最も古いデータが押し出される
+            self.data_queue.append(("analysis", analysis_result_dict))
+            logger.debug("分析結果をキューに追加")
+
     def _calculate_spectrum_optimized(self, chunk: np.ndarray) -> np.ndarray:
         """最適化されたFFT計算（事前割り当てバッファ使用）"""
         chunk_len = len(chunk)
         logger.debug(f"スペクトラム計算 - chunk_len: {chunk_len}")
-        chunk_float64 = chunk.astype(np.float64)
 
+        # 入力と同じfloat32のままバッファへ書き込む（中間コピーなし）
         if chunk_len <= self.N_FFT:
-            self._fft_buffer[:chunk_len] = chunk_float64
+            self._fft_buffer[:chunk_len] = chunk
             if chunk_len < self.N_FFT:
                 self._fft_buffer[chunk_len:] = 0
         else:
             # チャンクが大きすぎる場合は切り詰める
-            self._fft_buffer[:] = chunk_float64[: self.N_FFT]
+            self._fft_buffer[:] = chunk[: self.N_FFT]
 
-        # FFT計算
-        fft_result = np.fft.rfft(self._fft_buffer.astype(np.float64))
+        # FFT計算（scipy.fftはfloat32のまま計算し、プランもキャッシュされる）
+        fft_result = sp_fft.rfft(self._fft_buffer)
 
-        # 絶対値を計算
-        spectrum = np.abs(fft_result) / self.N_FFT
+        # 絶対値を計算（complex64の絶対値はfloat32のため変換コピー不要）
+        spectrum = np.abs(fft_result)
+        spectrum /= self.N_FFT
 
-        return spectrum.astype(np.float32)  # メモリ効率のためfloat32で返す
+        return spectrum
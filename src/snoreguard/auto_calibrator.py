@@ -12,11 +12,11 @@ from collections import defaultdict
 from dataclasses import dataclass
 from typing import Dict, List, Tuple, Optional, Callable
 
-import librosa
 import numpy as np
 import sounddevice as sd
-from scipy.signal import butter, sosfilt
+from scipy.signal import butter, sosfilt, sosfilt_zi
 
+from core.rule_processor import FeatureExtractor
 from core.settings import RuleSettings
 
 logger = logging.getLogger(__name__)
@@ -117,8 +117,8 @@ class StageRecorder:
             # チャンクを結合して1つの音声データにする
             audio_data = (
                 np.concatenate(self.audio_chunk_buffer, axis=0)
-                .flatten()
-                .astype(np.float32)
+                .reshape(-1)
+                .astype(np.float32, copy=False)
             )
 
             # 品質チェック
@@ -172,14 +172,31 @@ class FeatureAnalyzer:
         self.sample_rate = sample_rate
         self.frame_length = 480
         self.hop_length = 240
-        self.sos_filter = butter(
+        # 設計はfloat64で行い、録音データと揃えてfloat32でフィルタリングする
+        sos_filter = butter(
             N=5, Wn=[80, 1600], btype="bandpass", fs=sample_rate, output="sos"
         )
+        self.sos_filter = sos_filter.astype(np.float32)
+        self._filter_zi_template = sosfilt_zi(sos_filter).astype(np.float32)
+        # 検出時と同じ尺度の特徴量を得るため、検出エンジンの抽出器を共用
+        # （F0は分布を調べるため検出時より広い範囲で推定）
+        self.feature_extractor = FeatureExtractor(
+            sample_rate,
+            self.frame_length,
+            self.hop_length,
+            RuleSettings(f0_min_hz=50.0, f0_max_hz=400.0),
+        )
 
     def analyze_audio(self, audio_data: np.ndarray, label: str) -> AudioSample:
         """音響特徴量分析"""
         try:
-            filtered_audio = sosfilt(self.sos_filter, audio_data)
+            audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
+            # 先頭サンプルで初期状態を定常化し、録音冒頭の過渡応答を避ける
+            filtered_audio, _ = sosfilt(
+                self.sos_filter,
+                audio_data,
+                zi=self._filter_zi_template * audio_data[0],
+            )
             features = self._extract_all_features(filtered_audio)
             statistics = self._calculate_statistics_with_outlier_removal(features)
 
@@ -200,34 +217,7 @@ class FeatureAnalyzer:
         """音響特徴量抽出"""
         features = {}
         try:
-            features["rms"] = librosa.feature.rms(
-                y=audio, frame_length=self.frame_length, hop_length=self.hop_length
-            )[0]
-
-            features["spectral_centroid"] = librosa.feature.spectral_centroid(
-                y=audio,
-                sr=self.sample_rate,
-                n_fft=self.frame_length,
-                hop_length=self.hop_length,
-            )[0]
-
-            features["zcr"] = librosa.feature.zero_crossing_rate(
-                y=audio, frame_length=self.frame_length, hop_length=self.hop_length
-            )[0]
-
-            # より安定したf0抽出設定
-            f0, voiced_flag, voiced_probs = librosa.pyin(
-                y=audio,
-                fmin=50,
-                fmax=400,
-                frame_length=self.frame_length,
-                hop_length=self.hop_length,
-                sr=self.sample_rate,
-            )
-
-            features["f0"] = np.nan_to_num(f0, nan=0.0)
-            features["voiced_probs"] = voiced_probs
-
+            features = self.feature_extractor.extract_features(audio)
         except Exception as e:
             logger.error(f"特徴量抽出エラー: {e}")
             # エラー時はゼロ配列で初期化
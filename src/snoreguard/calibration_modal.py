@@ -5,16 +5,75 @@
 SnoreGuard 自動キャリブレーション モーダルウィンドウ
 """
 
+import functools
 import logging
+import math
+import operator
+import threading
 import tkinter as tk
+from copy import deepcopy
+from dataclasses import fields
 from typing import Optional, Callable
 
 import customtkinter as ctk
 
+from core.settings import RuleSettings
 from snoreguard.auto_calibrator import AutoCalibrator, CalibrationResult
 
 logger = logging.getLogger(__name__)
 
+# 設定項目の日本語名マッピング
+CALIBRATION_FIELD_LABELS = {
+    "energy_threshold": "エネルギー閾値",
+    "f0_confidence_threshold": "F0信頼度閾値",
+    "spectral_centroid_threshold": "スペクトル重心閾値",
+    "zcr_threshold": "ZCR閾値",
+    "min_duration_seconds": "最小持続時間",
+    "max_duration_seconds": "最大持続時間",
+    "f0_min_hz": "F0最小値",
+    "f0_max_hz": "F0最大値",
+    "periodicity_event_count": "周期イベント数",
+    "periodicity_window_seconds": "周期ウィンドウ",
+    "min_event_interval_seconds": "最小イベント間隔",
+    "max_event_interval_seconds": "最大イベント間隔",
+}
+
+
+def _format_float_setting(value) -> str:
+    """小数の設定値を表示用の文字列に整形（末尾の0を省く）"""
+    return f"{value:.4f}".rstrip("0").rstrip(".")
+
+
+# 小数の設定値の比較（値の大きさに応じた相対誤差と、従来どおりの絶対誤差を許容）
+_float_setting_equal = functools.partial(math.isclose, rel_tol=1e-6, abs_tol=1e-6)
+
+# 比較する設定項目（フィールド名, 表示名, 整形関数, 比較関数）を一度だけ解決
+_CALIBRATION_FIELDS = tuple(
+    (
+        f.name,
+        CALIBRATION_FIELD_LABELS.get(f.name, f.name),
+        _format_float_setting if f.type is float else str,
+        _float_setting_equal if f.type is float else operator.eq,
+    )
+    for f in fields(RuleSettings)
+)
+
+
+def calibration_changes(old_settings, new_settings) -> list[tuple[str, str, str]]:
+    """変更された設定項目を (表示名, 変更前, 変更後) の一覧で取得"""
+    # 項目は十数個のみで、キャリブレーション完了時に1回呼ばれるだけのため、
+    # NumPy配列へ詰め替えるより項目ごとの比較関数で判定する方が軽い
+    changes = []
+    for name, display_name, format_value, is_equal in _CALIBRATION_FIELDS:
+        old_value = getattr(old_settings, name)
+        new_value = getattr(new_settings, name)
+        # 値が変更された場合のみ表示
+        if not is_equal(old_value, new_value):
+            changes.append(
+                (display_name, format_value(old_value), format_value(new_value))
+            )
+    return changes
+
 
 class CalibrationModal:
     """自動キャリブレーション用のモーダルウィンドウ"""
@@ -282,8 +341,6 @@ class CalibrationModal:
         try:
             # 現在の設定を保存（アプリインスタンスから取得）
             if hasattr(self, "app") and hasattr(self.app, "rule_settings"):
-                from copy import deepcopy
-
                 self.original_settings = deepcopy(self.app.rule_settings)
 
             if not self.auto_calibrator.start_calibration():
@@ -358,7 +415,6 @@ class CalibrationModal:
 
     def _start_recording(self, stage_name: str, duration: float):
         """録音開始"""
-        import threading
 
         def record_thread():
             success = self.auto_calibrator.recorder.record_stage_async(
@@ -458,57 +514,21 @@ class CalibrationModal:
             if not self.original_settings or not self.calibration_result:
                 return
 
-            from dataclasses import fields
-
             old_settings = self.original_settings
             new_settings = self.calibration_result.optimal_settings
             confidence = self.calibration_result.confidence_scores.get(
                 "total_confidence", 0
             )
 
-            # 設定項目の日本語名マッピング
-            field_names = {
-                "energy_threshold": "エネルギー閾値",
-                "f0_confidence_threshold": "F0信頼度閾値",
-                "spectral_centroid_threshold": "スペクトル重心閾値",
-                "zcr_threshold": "ZCR閾値",
-                "min_duration_seconds": "最小持続時間",
-                "max_duration_seconds": "最大持続時間",
-                "f0_min_hz": "F0最小値",
-                "f0_max_hz": "F0最大値",
-                "periodicity_event_count": "周期イベント数",
-                "periodicity_window_seconds": "周期ウィンドウ",
-                "min_event_interval_seconds": "最小イベント間隔",
-                "max_event_interval_seconds": "最大イベント間隔",
-            }
-
             # 結果テキスト作成
             result_text = f"統計的最適化完了 (信頼度: {confidence:.1%})\n\n"
             result_text += "=== 変更された設定値 ===\n"
 
-            changes_found = False
-
-            for field in fields(old_settings):
-                field_name = field.name
-                old_value = getattr(old_settings, field_name)
-                new_value = getattr(new_settings, field_name)
-
-                # 値が変更された場合のみ表示
-                if abs(old_value - new_value) > 1e-6:  # 浮動小数点数の比較
-                    changes_found = True
-                    display_name = field_names.get(field_name, field_name)
-
-                    # 値の形式を整える
-                    if isinstance(old_value, float):
-                        old_str = f"{old_value:.4f}".rstrip("0").rstrip(".")
-                        new_str = f"{new_value:.4f}".rstrip("0").rstrip(".")
-                    else:
-                        old_str = str(old_value)
-                        new_str = str(new_value)
-
-                    result_text += f"{display_name}:\n  {old_str} → {new_str}\n\n"
+            changes = calibration_changes(old_settings, new_settings)
+            for display_name, old_str, new_str in changes:
+                result_text += f"{display_name}:\n  {old_str} → {new_str}\n\n"
 
-            if not changes_found:
+            if not changes:
                 result_text += "変更された設定項目はありません\n"
 
             result_text += "========================"
@@ -195,7 +195,6 @@ class QuickSplashScreen:
             try:
                 initialization_callback(self.update_status)
                 self.update_status("起動完了")
-                time.sleep(0.3)
                 if self.on_initialization_complete:
                     # メインスレッドで完了コールバックを実行
                     self.splash_root.after(0, self.on_initialization_complete)
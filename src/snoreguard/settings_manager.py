@@ -1,3 +1,4 @@
+import copy
 import json
 import logging
 import threading
@@ -14,6 +15,7 @@ class SettingsManager:
     - キャッシュ機能
     - ファイルの変更検知
     - スレッドセーフな操作
+    - バックグラウンドでの保存（連続した保存要求は最新のみ書き込む）
     """
 
     def __init__(self, filepath: Path):
@@ -22,6 +24,12 @@ class SettingsManager:
         self._cache: dict[str, Any] | None = None  # キャッシュ
         self._cache_lock = threading.RLock()  # ロック
         self._file_mtime: float | None = None  # ファイルの変更時刻
+
+        # バックグラウンド保存用
+        self._pending: dict[str, Any] | None = None  # 書き込み待ちの最新設定
+        self._pending_lock = threading.Lock()  # 書き込み待ち設定のロック
+        self._save_event = threading.Event()  # 書き込み要求の通知
+        self._writer_thread: threading.Thread | None = None  # 書き込みスレッド
         logger.debug("SettingsManager初期化完了")
 
     # 設定をファイルから読み込む
@@ -100,6 +108,40 @@ class SettingsManager:
                         logger.warning("一時ファイルクリーンアップ失敗")
                         pass
 
+    # 設定をバックグラウンドで保存（呼び出し元はファイル書き込みを待たない）
+    def save_async(self, settings: dict[str, Any]):
+        with self._pending_lock:
+            # 呼び出し元が後から辞書を変更しても影響しないよう複製して保持
+            self._pending = copy.deepcopy(settings)
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop,
+                    daemon=True,
+                    name="SettingsManager-Writer",
+                )
+                self._writer_thread.start()
+        self._save_event.set()
+
+    # 書き込み待ちの設定があれば同期的に保存（終了時用）
+    def flush(self):
+        self._write_pending()
+
+    def _writer_loop(self):
+        """書き込みスレッド（要求が重なった場合は最新の設定のみ書き込む）"""
+        while True:
+            self._save_event.wait()
+            self._save_event.clear()
+            self._write_pending()
+
+    def _write_pending(self):
+        """書き込み待ちの設定を取り出して保存"""
+        # 取り出しから書き込みまでを保存ロック内で行い、古い設定での上書きを防ぐ
+        with self._cache_lock:
+            with self._pending_lock:
+                settings, self._pending = self._pending, None
+            if settings is not None:
+                self.save(settings)
+
     # キャッシュをクリア
     def clear_cache(self):
         logger.debug("設定キャッシュクリア")
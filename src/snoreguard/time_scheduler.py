@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import functools
 import logging
 import threading
 from datetime import datetime, time as dt_time
@@ -7,6 +8,13 @@ from typing import Callable, Optional
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=128)
+def parse_hhmm(value: str) -> dt_time:
+    """HH:MM形式の文字列を時刻に変換（同じ文字列の解析結果は再利用）"""
+    hour, minute = value.split(":")
+    return dt_time(int(hour), int(minute))
+
+
 class TimeScheduler:
     """
     シンプルな時刻指定での自動検出開始/停止スケジューラー
@@ -24,13 +32,16 @@ class TimeScheduler:
         self.enabled = False
         self.start_time: Optional[dt_time] = None  # 開始時刻 (例: 22:00)
         self.end_time: Optional[dt_time] = None  # 終了時刻 (例: 06:00)
+        # 毎回の比較用に0時からの経過分へ変換した時刻（configure時に1回だけ計算）
+        self._start_minute: Optional[int] = None
+        self._end_minute: Optional[int] = None
 
         # 内部状態
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._last_start_check: Optional[str] = None  # 最後に開始チェックした時刻
-        self._last_stop_check: Optional[str] = None  # 最後に停止チェックした時刻
+        self._last_start_check: Optional[int] = None  # 最後に開始チェックした時刻(分)
+        self._last_stop_check: Optional[int] = None  # 最後に停止チェックした時刻(分)
 
         logger.debug("TimeScheduler初期化完了")
 
@@ -56,6 +67,8 @@ class TimeScheduler:
         self.enabled = enabled
         self.start_time = start_time
         self.end_time = end_time
+        self._start_minute = self._to_minute_of_day(start_time)
+        self._end_minute = self._to_minute_of_day(end_time)
 
         # チェック状態をリセット
         self._last_start_check = None
@@ -65,6 +78,18 @@ class TimeScheduler:
         if was_running and enabled:
             self.start()
 
+    @staticmethod
+    def _to_minute_of_day(value: Optional[dt_time]) -> Optional[int]:
+        """時刻を0時からの経過分に変換"""
+        if value is None:
+            return None
+        return value.hour * 60 + value.minute
+
+    @staticmethod
+    def _format_minute(minute_of_day: int) -> str:
+        """0時からの経過分をHH:MM形式の文字列に変換（ログ用）"""
+        return f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
     def start(self):
         """スケジューラー開始"""
         if self._running:
@@ -105,16 +130,16 @@ class TimeScheduler:
 
         while self._running and not self._stop_event.is_set():
             try:
-                current_time = datetime.now().time()
-                current_time_str = current_time.strftime("%H:%M")
+                now = datetime.now()
+                current_minute = now.hour * 60 + now.minute
 
                 # 開始時刻チェック
-                if self._should_trigger_start(current_time_str):
-                    self._execute_start_detection(current_time_str)
+                if self._should_trigger_start(current_minute):
+                    self._execute_start_detection(current_minute)
 
                 # 停止時刻チェック
-                if self._should_trigger_stop(current_time_str):
-                    self._execute_stop_detection(current_time_str)
+                if self._should_trigger_stop(current_minute):
+                    self._execute_stop_detection(current_minute)
 
                 # 30秒間隔でチェック
                 if self._stop_event.wait(1):
@@ -128,55 +153,55 @@ class TimeScheduler:
 
         logger.info("スケジューラーループ終了")
 
-    def _should_trigger_start(self, current_time_str: str) -> bool:
+    def _should_trigger_start(self, current_minute: int) -> bool:
         """開始時刻トリガーをチェック"""
-        if not self.enabled or not self.start_time:
+        if not self.enabled or self._start_minute is None:
             return False
 
-        start_time_str = self.start_time.strftime("%H:%M")
-
         # 既に同じ時刻でチェック済みの場合はスキップ
-        if self._last_start_check == current_time_str:
+        if self._last_start_check == current_minute:
             return False
 
         # 現在時刻が開始時刻と一致するかチェック（分単位）
-        if current_time_str == start_time_str:
-            self._last_start_check = current_time_str
+        if current_minute == self._start_minute:
+            self._last_start_check = current_minute
             return True
 
         return False
 
-    def _should_trigger_stop(self, current_time_str: str) -> bool:
+    def _should_trigger_stop(self, current_minute: int) -> bool:
         """停止時刻トリガーをチェック"""
-        if not self.enabled or not self.end_time:
+        if not self.enabled or self._end_minute is None:
             return False
 
-        end_time_str = self.end_time.strftime("%H:%M")
-
         # 既に同じ時刻でチェック済みの場合はスキップ
-        if self._last_stop_check == current_time_str:
+        if self._last_stop_check == current_minute:
             return False
 
         # 現在時刻が停止時刻と一致するかチェック（分単位）
-        if current_time_str == end_time_str:
-            self._last_stop_check = current_time_str
+        if current_minute == self._end_minute:
+            self._last_stop_check = current_minute
             return True
 
         return False
 
-    def _execute_start_detection(self, current_time_str: str):
+    def _execute_start_detection(self, current_minute: int):
         """検出開始を実行"""
         try:
-            logger.info(f"スケジューラーによる検出開始: {current_time_str}")
+            logger.info(
+                f"スケジューラーによる検出開始: {self._format_minute(current_minute)}"
+            )
             self.start_callback()
 
         except Exception as e:
             logger.error(f"スケジューラー検出開始エラー: {e}", exc_info=True)
 
-    def _execute_stop_detection(self, current_time_str: str):
+    def _execute_stop_detection(self, current_minute: int):
         """検出停止を実行"""
         try:
-            logger.info(f"スケジューラーによる検出停止: {current_time_str}")
+            logger.info(
+                f"スケジューラーによる検出停止: {self._format_minute(current_minute)}"
+            )
             self.stop_callback()
 
         except Exception as e:
@@ -7,6 +7,7 @@ import customtkinter as ctk
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from core.settings import TimeSchedulerSettings
 from snoreguard import __version__
 
 logger = logging.getLogger(__name__)
@@ -350,6 +351,7 @@ class UIBuilder:
             hover_color="#E55A2B",
         )
         self.app.booth_button.pack(side="left")
+        self.app._update_ui_ready = True
 
     def _create_status_card(self, parent, row, col):
         """
@@ -572,8 +574,6 @@ class UIBuilder:
         time_frame.grid_columnconfigure(0, weight=1)
         time_frame.grid_columnconfigure(1, weight=1)
 
-        from core.settings import TimeSchedulerSettings
-
         defaults = TimeSchedulerSettings()
 
         self._create_time_input_section(
@@ -582,6 +582,12 @@ class UIBuilder:
         self._create_time_input_section(
             time_frame, "終了", 0, 1, defaults.end_time, "end"
         )
+        app._scheduler_time_vars = (
+            app.scheduler_start_hour_var,
+            app.scheduler_start_minute_var,
+            app.scheduler_end_hour_var,
+            app.scheduler_end_minute_var,
+        )
 
     def _create_time_input_section(
         self, parent, label_text, row, col, default_time, time_type
@@ -763,15 +769,24 @@ class UIBuilder:
         style_axis(app.ax_waveform)
         style_axis(app.ax_spectrum)
 
+        # 更新される線と塗りつぶしはanimatedとし、背景とは別に描画する（ブリット）
         app.waveform_x = np.arange(sr)
         (app.waveform_line,) = app.ax_waveform.plot(
-            app.waveform_x, np.zeros(sr), lw=1, color="cornflowerblue"
+            app.waveform_x, np.zeros(sr), lw=1, color="cornflowerblue", animated=True
         )
+        # 検出区間の塗りつぶし（描画ごとに頂点のみ更新する）
         app.waveform_fill = app.ax_waveform.fill_between(
-            app.waveform_x, 0, 0, alpha=0.3, color="orange"
+            app.waveform_x, 0, 0, alpha=0.5, color="orange", animated=True
         )
         app.spectrum_x = np.fft.rfftfreq(n_fft, 1 / sr)
         (app.spectrum_line,) = app.ax_spectrum.plot(
-            app.spectrum_x, np.zeros(len(app.spectrum_x)), lw=1, color="cyan"
+            app.spectrum_x,
+            np.zeros(len(app.spectrum_x)),
+            lw=1,
+            color="cyan",
+            animated=True,
         )
+        # 全体の再描画（初回表示・リサイズ・軸変更時）のたびに背景を取り直す
+        app.plot_canvas.mpl_connect("draw_event", app._on_plot_draw)
+        app.plot_canvas.mpl_connect("resize_event", app._invalidate_plot_background)
         logger.debug("プロット初期化完了")
@@ -2,7 +2,13 @@
 import logging
 import threading
 
-from pythonosc import dispatcher, osc_server, udp_client
+from pythonosc import (
+    dispatcher,
+    osc_bundle_builder,
+    osc_message_builder,
+    osc_server,
+    udp_client,
+)
 
 from snoreguard.vrc.osc_query_service import OSCQueryService
 from snoreguard.vrc.mdns_client import OSCQueryServiceFinder
@@ -188,6 +194,27 @@ class VRCHandler:
             if self.log_callback:
                 self.log_callback(f"OSCフィードバック送信エラー: {e}", "error")
 
+    def send_feedback_bundle(self, messages: list[tuple[str, object]]) -> bool:
+        """複数の状態フィードバックを1つのOSCバンドルにまとめて送信（成否を返す）"""
+        try:
+            if not (self.osc_service and self.osc_service.osc_client):
+                logger.warning(f"OSCクライアントが初期化されていません: {messages}")
+                return False
+
+            bundle = osc_bundle_builder.OscBundleBuilder(osc_bundle_builder.IMMEDIATELY)
+            for address, value in messages:
+                message = osc_message_builder.OscMessageBuilder(address=address)
+                message.add_argument(value)
+                bundle.add_content(message.build())
+            self.osc_service.osc_client.send(bundle.build())
+            logger.debug(f"OSCフィードバック一括送信: {messages}")
+            return True
+        except Exception as e:
+            logger.error(f"OSCフィードバック送信エラー: {e}", exc_info=True)
+            if self.log_callback:
+                self.log_callback(f"OSCフィードバック送信エラー: {e}", "error")
+            return False
+
     def _update_osc_service_connection(self, host: str, port: int):
         """OSCサービスの接続先を更新"""
         self.osc_service.vrchat_host = host